@@ -33,6 +33,47 @@ assert any(app in INSTALLED_APPS for app in ['posts.apps.PostsConfig', 'posts'])
     'Пожалуйста зарегистрируйте приложение в `settings.INSTALLED_APPS`'
 )
 
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+
+from posts.lookups import clear_lookup_caches
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    clear_lookup_caches()
+    yield
+    cache.clear()
+    clear_lookup_caches()
+
+
+def pytest_collection_modifyitems(items):
+    """С настроенной репликой транзакционные тесты читают и её зеркало.
+
+    Остальные идут внутри транзакции, и роутер сам читает из основной базы.
+    """
+    if 'replica' not in settings.DATABASES:
+        return
+    for item in items:
+        marker = item.get_closest_marker('django_db')
+        if (
+            marker is None
+            or not marker.kwargs.get('transaction')
+            or 'databases' in marker.kwargs
+        ):
+            continue
+        item.add_marker(pytest.mark.django_db(
+            databases=['default', 'replica'], **marker.kwargs,
+        ), append=False)
+
+
 pytest_plugins = [
     'tests.fixtures.fixture_user',
     'tests.fixtures.fixture_data',
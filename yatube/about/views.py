@@ -3,7 +3,9 @@ from django.views.generic.base import TemplateView
 
 class AboutAuthorView(TemplateView):
     template_name = 'about/author.html'
+    replica_reads = True
 
 
 class AboutTechView(TemplateView):
     template_name = 'about/tech.html'
+    replica_reads = True
@@ -1,5 +1,16 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from . import mail  # noqa: F401
+        from .monitoring import register_stats
+        from .query_budget import get_query_stats
+        from .ratelimit import get_rate_limit_stats
+        from .sqlite import configure_sqlite
+        connection_created.connect(configure_sqlite)
+        register_stats('queries', get_query_stats)
+        register_stats('rate_limits', get_rate_limit_stats)
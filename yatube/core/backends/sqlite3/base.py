@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        """В профиле SQLITE_PRODUCTION транзакция начинается с BEGIN IMMEDIATE.
+
+        Обычный BEGIN берёт блокировку записи только на первом INSERT или
+        UPDATE. Если транзакция перед этим что-то читала, а другой процесс
+        уже пишет, SQLite сразу отвечает «database is locked», не дожидаясь
+        busy_timeout. BEGIN IMMEDIATE ждёт блокировку в самом начале.
+        """
+        if settings.SQLITE_PRODUCTION:
+            self.cursor().execute('BEGIN IMMEDIATE')
+        else:
+            super()._start_transaction_under_autocommit()
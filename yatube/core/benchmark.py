@@ -0,0 +1,63 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import (setup_databases, setup_test_environment,
+                               teardown_databases,
+                               teardown_test_environment)
+
+
+@contextmanager
+def benchmark_database(name=None, verbosity=0):
+    """Отдельная тестовая база, чтобы замеры не трогали рабочие данные.
+
+    name - файл для тестовой базы; по умолчанию SQLite держит её в памяти.
+    DEBUG выключается, чтобы журнал запросов не искажал замеры.
+    """
+    if name is not None:
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = name
+    setup_test_environment(debug=False)
+    old_config = setup_databases(verbosity=verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def measure(func, repeat, before=None):
+    """Время в секундах для каждого из repeat вызовов func."""
+    samples = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    index = round(percent / 100 * (len(ordered) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Среднее и перцентили выборки в миллисекундах."""
+    return {
+        'mean': statistics.mean(samples) * 1000,
+        'p50': percentile(samples, 50) * 1000,
+        'p95': percentile(samples, 95) * 1000,
+        'p99': percentile(samples, 99) * 1000,
+    }
+
+
+def format_summary(name, samples):
+    summary = summarize(samples)
+    return (
+        f'{name}: mean {summary["mean"]:.2f} ms, '
+        f'p50 {summary["p50"]:.2f} ms, p95 {summary["p95"]:.2f} ms, '
+        f'p99 {summary["p99"]:.2f} ms'
+    )
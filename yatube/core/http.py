@@ -0,0 +1,9 @@
+import hashlib
+
+from django.utils.http import quote_etag
+
+
+def make_etag(*parts):
+    """Сильный ETag из хеша частей, от которых зависит ответ."""
+    value = '|'.join(str(part) for part in parts)
+    return quote_etag(hashlib.sha1(value.encode()).hexdigest())
@@ -0,0 +1,175 @@
+import json
+import logging
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+class Task:
+    def __init__(self, name, handler, batch_size):
+        self.name = name
+        self.handler = handler
+        self.batch_size = batch_size
+
+
+def task(name, batch_size=1):
+    """Регистрирует обработчик задач name.
+
+    Обработчик получает список данных задач (не длиннее batch_size)
+    и возвращает список той же длины: None для выполненной задачи или
+    исключение для той, которую нужно повторить.
+    """
+    def decorator(handler):
+        TASKS[name] = Task(name, handler, batch_size)
+        return handler
+    return decorator
+
+
+def enqueue(name, payload, delay=0, max_attempts=None):
+    """Ставит задачу в очередь в текущей транзакции.
+
+    Если транзакция откатится, задача пропадёт вместе с ней, поэтому
+    письма о несохранённых изменениях не уходят.
+    """
+    if name not in TASKS:
+        raise ValueError(f'Неизвестная задача {name}')
+    return Job.objects.create(
+        name=name,
+        payload=json.dumps(payload, ensure_ascii=False),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def ready_jobs(now):
+    return Job.objects.filter(
+        Q(status=Job.PENDING, run_at__lte=now)
+        | Q(status=Job.RUNNING, locked_until__lt=now)
+    )
+
+
+def claim_jobs(limit):
+    """Захватывает до limit готовых задач для этого обработчика.
+
+    Задачи, захваченные упавшим обработчиком, снова становятся
+    доступны по истечении JOB_LEASE секунд.
+    """
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    ids = list(ready_jobs(now).order_by('run_at', 'id').values_list(
+        'id', flat=True)[:limit])
+    ready_jobs(now).filter(pk__in=ids).update(
+        status=Job.RUNNING,
+        claimed_by=token,
+        locked_until=now + timedelta(seconds=settings.JOB_LEASE),
+    )
+    return list(Job.objects.filter(claimed_by=token, status=Job.RUNNING))
+
+
+def renew_lease(jobs):
+    """Продлевает аренду задач перед пачкой; возвращает ещё свои.
+
+    Задачи, которые после истечения аренды захватил другой обработчик,
+    отбрасываются, чтобы не выполнять их дважды.
+    """
+    mine = Job.objects.filter(
+        pk__in=[job.pk for job in jobs],
+        claimed_by__in={job.claimed_by for job in jobs},
+        status=Job.RUNNING,
+    )
+    mine.update(locked_until=timezone.now() + timedelta(
+        seconds=settings.JOB_LEASE))
+    held = set(mine.values_list('pk', flat=True))
+    return [job for job in jobs if job.pk in held]
+
+
+def retry_delay(attempts):
+    return settings.JOB_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def finish_jobs(jobs, errors):
+    """Записывает итоги пачки; возвращает число удалённых задач.
+
+    Меняются только задачи, которые всё ещё захвачены этим обработчиком.
+    """
+    done = []
+    for job, error in zip(jobs, errors):
+        if error is None:
+            done.append(job.pk)
+            continue
+        job.attempts += 1
+        job.last_error = repr(error)
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+            logger.error('Задача %s не выполнена: %r', job, error)
+        else:
+            job.status = Job.PENDING
+            job.run_at = timezone.now() + timedelta(
+                seconds=retry_delay(job.attempts))
+        Job.objects.filter(pk=job.pk, claimed_by=job.claimed_by).update(
+            attempts=job.attempts, last_error=job.last_error,
+            claimed_by='', locked_until=None,
+            status=job.status, run_at=job.run_at)
+    deleted, _ = Job.objects.filter(
+        pk__in=done, claimed_by__in={job.claimed_by for job in jobs},
+    ).delete()
+    return deleted
+
+
+def run_batch(name, jobs):
+    """Выполняет пачку задач одного вида; возвращает число выполненных."""
+    jobs = renew_lease(jobs)
+    if not jobs:
+        return 0
+    try:
+        task = TASKS[name]
+        errors = list(task.handler(
+            [json.loads(job.payload) for job in jobs]))
+        if len(errors) != len(jobs):
+            raise ValueError(f'Обработчик {name} вернул не все результаты')
+    except Exception as error:
+        logger.exception('Пачка задач %s упала', name)
+        errors = [error] * len(jobs)
+    return finish_jobs(jobs, errors)
+
+
+def batches(jobs):
+    by_name = defaultdict(list)
+    for job in jobs:
+        by_name[job.name].append(job)
+    for name, named_jobs in by_name.items():
+        size = TASKS[name].batch_size if name in TASKS else 1
+        for start in range(0, len(named_jobs), size):
+            yield name, named_jobs[start:start + size]
+
+
+def run_in_thread(name, jobs):
+    try:
+        return run_batch(name, jobs)
+    finally:
+        connections.close_all()
+
+
+def run_pending(limit=None, threads=1):
+    """Один проход очереди; возвращает число выполненных задач.
+
+    Задачи одного вида объединяются в пачки по batch_size обработчика,
+    пачки выполняются в пуле из threads потоков.
+    """
+    jobs = claim_jobs(limit or settings.JOB_BATCH_SIZE)
+    if threads <= 1:
+        return sum(run_batch(name, batch) for name, batch in batches(jobs))
+    with ThreadPoolExecutor(threads) as pool:
+        return sum(pool.map(lambda args: run_in_thread(*args), batches(jobs)))
@@ -0,0 +1,78 @@
+import base64
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .jobs import enqueue, task
+
+SEND_EMAIL = 'send_email'
+
+
+def serialize_message(message):
+    """Данные письма для JSON; вложения кодируются в base64."""
+    attachments = []
+    for attachment in message.attachments:
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode()
+        attachments.append(
+            (filename, base64.b64encode(content).decode(), mimetype))
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': getattr(message, 'alternatives', []),
+        'attachments': attachments,
+    }
+
+
+def build_message(data, connection):
+    message = EmailMultiAlternatives(
+        subject=data['subject'],
+        body=data['body'],
+        from_email=data['from_email'],
+        to=data['to'],
+        cc=data['cc'],
+        bcc=data['bcc'],
+        reply_to=data['reply_to'],
+        headers=data['headers'],
+        alternatives=[tuple(item) for item in data['alternatives']],
+        connection=connection,
+    )
+    for filename, content, mimetype in data['attachments']:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    return message
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который только ставит письма в очередь задач.
+
+    Письма отправляет обработчик очереди через QUEUED_EMAIL_BACKEND,
+    поэтому запрос не ждёт отрисовки и доставки.
+    """
+
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            enqueue(SEND_EMAIL, serialize_message(message))
+        return len(email_messages)
+
+
+@task(SEND_EMAIL, batch_size=50)
+def send_email(payloads):
+    """Отправляет пачку писем через одно соединение с почтовым сервером."""
+    errors = []
+    with get_connection(settings.QUEUED_EMAIL_BACKEND) as connection:
+        for data in payloads:
+            try:
+                build_message(data, connection).send()
+            except Exception as error:
+                errors.append(error)
+            else:
+                errors.append(None)
+    return errors
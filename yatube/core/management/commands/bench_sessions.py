@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmark import benchmark_database, measure, summarize
+
+User = get_user_model()
+
+ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+}
+
+
+class SQLRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает число запросов и задержку страниц для сессий '
+        'в базе и в кэше с базой'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument(
+            '--url', action='append', dest='urls',
+            help='Адрес страницы; по умолчанию главная и «Об авторе»')
+
+    def handle(self, *args, **options):
+        urls = options['urls'] or [
+            reverse('posts:index'), reverse('about:author')]
+        results = {}
+        for name, engine in ENGINES.items():
+            with override_settings(SESSION_ENGINE=engine), \
+                    benchmark_database():
+                results[name] = self.run_engine(urls, options['repeat'])
+        for url in urls:
+            self.report(url, results)
+
+    def run_engine(self, urls, repeat):
+        user = User.objects.create_user(username='bench_user')
+        clients = {'аноним': Client(), 'автор': Client()}
+        clients['автор'].force_login(user)
+        results = {}
+        for url in urls:
+            for reader, client in clients.items():
+                cache.clear()
+                client.get(url)
+                recorder = SQLRecorder()
+                with connection.execute_wrapper(recorder):
+                    client.get(url)
+                samples = measure(lambda: client.get(url), repeat)
+                results[url, reader] = dict(
+                    summarize(samples),
+                    queries=len(recorder.queries),
+                    session_queries=sum(
+                        'django_session' in sql for sql in recorder.queries),
+                )
+        return results
+
+    def report(self, url, results):
+        self.stdout.write(self.style.MIGRATE_HEADING(url))
+        for reader in ('аноним', 'автор'):
+            before = results['db'][url, reader]
+            after = results['cached_db'][url, reader]
+            self.stdout.write(
+                f'  {reader:<7} запросов {before["queries"]} -> '
+                f'{after["queries"]} (к django_session '
+                f'{before["session_queries"]} -> '
+                f'{after["session_queries"]}), p50 {before["p50"]:.2f} -> '
+                f'{after["p50"]:.2f} ms'
+            )
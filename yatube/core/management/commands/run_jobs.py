@@ -0,0 +1,32 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.jobs import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Обработчик фоновых задач: письма и другие медленные действия'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти')
+        parser.add_argument(
+            '--batch', type=int, default=settings.JOB_BATCH_SIZE,
+            help='Сколько задач захватывать за проход')
+        parser.add_argument('--threads', type=int, default=1)
+        parser.add_argument(
+            '--interval', type=float, default=settings.JOB_POLL_INTERVAL,
+            help='Пауза, когда очередь пуста, секунд')
+
+    def handle(self, *args, **options):
+        while True:
+            done = run_pending(options['batch'], options['threads'])
+            if done:
+                self.stdout.write(f'Выполнено задач: {done}')
+            if options['once']:
+                return
+            if done < options['batch']:
+                time.sleep(options['interval'])
@@ -0,0 +1,123 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .query_budget import (QueryBudgetExceeded, QueryRecorder,
+                           get_query_budget, logger, record_queries)
+from .replicas import allows_replica_reads, reset_replica, use_replica
+from .server_timing import (log_timings, reset_timings, start_timings,
+                            time_queries)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class QueryBudgetMiddleware:
+    """Считает запросы и время в базе для каждого имени URL.
+
+    Если представление превысило бюджет из core.query_budget.query_budget,
+    пишет предупреждение, а при QUERY_BUDGET_STRICT - бросает исключение.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        match = request.resolver_match
+        if match is None:
+            return response
+        record_queries(match.view_name, recorder.count, recorder.duration)
+        budget = get_query_budget(match.func)
+        if budget is not None and recorder.count > budget:
+            message = (
+                f'{match.view_name}: {recorder.count} SQL-запросов '
+                f'при бюджете {budget}'
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Направляет чтения представлений с core.replicas.replica_reads
+    в реплику.
+
+    После запроса, который мог что-то записать (POST и т. п.), ставит
+    куку REPLICA_PIN_COOKIE на REPLICA_STICKY_SECONDS: пока она жива,
+    автор читает только из основной базы и видит свои изменения.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request._replica_token is not None:
+                reset_replica(request._replica_token)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS, httponly=True)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in SAFE_METHODS
+            and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+            and allows_replica_reads(view_func)
+        ):
+            request._replica_token = use_replica()
+
+
+class ServerTimingMiddleware:
+    """Отдаёт в заголовке Server-Timing время фаз запроса.
+
+    db - SQL во всех базах, view - само представление без SQL и шаблонов,
+    tpl - рендеринг шаблонов, cp-<имя> - контекстные процессоры
+    (их время даёт core.server_timing.TimedDjangoTemplates), total - весь
+    запрос внутри этого middleware. При SERVER_TIMING_LOG те же данные
+    пишутся JSON-строкой в лог core.server_timing.
+
+    Для потоковых ответов учитывается только время до начала отдачи.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (settings.SERVER_TIMING or settings.SERVER_TIMING_LOG):
+            return self.get_response(request)
+        started = time.perf_counter()
+        timings, token = start_timings()
+        request._timings = timings
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(time_queries))
+                response = self.get_response(request)
+            timings.stop_all()
+        finally:
+            reset_timings(token)
+        total = time.perf_counter() - started
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = timings.header(total)
+        if settings.SERVER_TIMING_LOG:
+            log_timings(request, response, timings, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = getattr(request, '_timings', None)
+        if timings is not None:
+            timings.start('view')
@@ -0,0 +1,16 @@
+import os
+
+_sources = {}
+
+
+def register_stats(name, get_stats):
+    """Добавляет в снимок collect_stats() счётчики get_stats() под name."""
+    _sources[name] = get_stats
+
+
+def collect_stats():
+    """Счётчики всех зарегистрированных источников в этом процессе."""
+    stats = {'pid': os.getpid()}
+    for name, get_stats in _sources.items():
+        stats[name] = get_stats()
+    return stats
@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+_stats = defaultdict(lambda: {
+    'requests': 0,
+    'queries': 0,
+    'db_time': 0.0,
+    'max_queries': 0,
+})
+_stats_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше запросов, чем ему разрешено."""
+
+
+def query_budget(max_queries):
+    """Объявляет, сколько SQL-запросов может выполнить представление."""
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def get_query_budget(view):
+    """Бюджет представления-функции или класса, либо None."""
+    view_class = getattr(view, 'view_class', None)
+    if view_class is not None:
+        return getattr(view_class, 'query_budget', None)
+    return getattr(view, 'query_budget', None)
+
+
+class QueryRecorder:
+    """Обёртка execute_wrapper, считающая запросы и время в базе."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+def record_queries(view_name, count, duration):
+    with _stats_lock:
+        stats = _stats[view_name]
+        stats['requests'] += 1
+        stats['queries'] += count
+        stats['db_time'] += duration
+        stats['max_queries'] = max(stats['max_queries'], count)
+
+
+def get_query_stats():
+    """Снимок накопленной статистики запросов по именам URL."""
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def reset_query_stats():
+    with _stats_lock:
+        _stats.clear()
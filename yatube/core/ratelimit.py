@@ -0,0 +1,102 @@
+import hashlib
+import math
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+IP = 'ip'
+
+_rejections = Counter()
+_rejections_lock = threading.Lock()
+
+
+def bucket_key(scope, kind, value):
+    digest = hashlib.md5(value.encode()).hexdigest()
+    return f'ratelimit:{scope}:{kind}:{digest}'
+
+
+def take_token(key, capacity, period):
+    """Берёт жетон из ведра key; возвращает 0 или секунды до нового.
+
+    Ведро вмещает capacity жетонов и наполняется за period секунд.
+    Состояние (жетоны, время) хранится в кэше default, общем для всех
+    процессов (см. CACHES); одновременные запросы могут изредка получить
+    лишний жетон, что для защиты от потока допустимо.
+    """
+    rate = capacity / period
+    now = time.time()
+    tokens, updated = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens < 1:
+        cache.set(key, (tokens, now), period)
+        return (1 - tokens) / rate
+    cache.set(key, (tokens - 1, now), period)
+    return 0
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def check_rate_limit(request, scope):
+    """Секунды до следующей разрешённой попытки или 0.
+
+    Лимиты берутся из RATE_LIMITS[scope]: ключ ip - адрес клиента,
+    остальные ключи - поля формы (имя пользователя, почта).
+    """
+    for kind, (capacity, period) in settings.RATE_LIMITS[scope].items():
+        if kind == IP:
+            value = client_ip(request)
+        else:
+            value = request.POST.get(kind, '').strip().lower()
+        if not value:
+            continue
+        retry_after = take_token(
+            bucket_key(scope, kind, value), capacity, period)
+        if retry_after:
+            return retry_after
+    return 0
+
+
+def rate_limit(scope):
+    """Ограничивает POST-запросы к представлению по RATE_LIMITS[scope].
+
+    Проверка идёт до вызова представления, поэтому отклонённый запрос
+    не хеширует пароль и не отправляет писем.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method == 'POST':
+                retry_after = check_rate_limit(request, scope)
+                if retry_after:
+                    record_rejection(scope)
+                    response = HttpResponse(
+                        'Слишком много попыток, повторите позже',
+                        status=429)
+                    response['Retry-After'] = str(math.ceil(retry_after))
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_rejection(scope):
+    with _rejections_lock:
+        _rejections[scope] += 1
+
+
+def get_rate_limit_stats():
+    """Число отклонённых этим процессом запросов по областям ограничения."""
+    with _rejections_lock:
+        return dict(_rejections)
+
+
+def reset_rate_limit_stats():
+    with _rejections_lock:
+        _rejections.clear()
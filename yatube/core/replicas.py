@@ -0,0 +1,87 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.dispatch import Signal
+
+PRIMARY = 'default'
+
+# Отправляется командой sync_replica после копирования основной базы:
+# всё, что собрано из отстававшей реплики и закэшировано, устарело.
+replica_synced = Signal()
+
+_replica = ContextVar('replica', default=None)
+
+
+def replica_reads(view):
+    """Разрешает представлению читать из реплики."""
+    view.replica_reads = True
+    return view
+
+
+def allows_replica_reads(view):
+    view_class = getattr(view, 'view_class', None)
+    if view_class is not None:
+        return getattr(view_class, 'replica_reads', False)
+    return getattr(view, 'replica_reads', False)
+
+
+def use_replica():
+    """Выбирает реплику для текущего запроса; возвращает токен сброса."""
+    replicas = settings.DATABASE_REPLICAS
+    return _replica.set(random.choice(replicas) if replicas else None)
+
+
+def reset_replica(token):
+    _replica.reset(token)
+
+
+@contextmanager
+def reading_from_replica():
+    token = use_replica()
+    try:
+        yield
+    finally:
+        reset_replica(token)
+
+
+class PrimaryReplicaRouter:
+    """Пишет всегда в основную базу, читает из реплики, если разрешено.
+
+    Реплика выбирается один раз на запрос, чтобы все его чтения видели
+    одно состояние. Сессии читаются только из основной базы: их пишет
+    каждый вход на сайт.
+
+    Тестовое зеркало основной базы (TEST['MIRROR']) - отдельное
+    соединение: строк из открытой транзакции основной базы оно не видит,
+    а SQLite ещё и блокирует таблицы. Пока такая транзакция открыта
+    (например, в TestCase), чтения идут в основную базу.
+    """
+
+    primary_apps = {'sessions'}
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in self.primary_apps:
+            return PRIMARY
+        replica = _replica.get()
+        if replica is None or self.mirrors_open_transaction(replica):
+            return PRIMARY
+        return replica
+
+    def mirrors_open_transaction(self, alias):
+        test_settings = settings.DATABASES.get(alias, {}).get('TEST', {})
+        return (
+            test_settings.get('MIRROR') == PRIMARY
+            and connections[PRIMARY].in_atomic_block
+        )
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.DATABASE_REPLICAS
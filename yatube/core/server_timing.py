@@ -0,0 +1,142 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+_timings = ContextVar('server_timings', default=None)
+
+
+class Timings:
+    """Время фаз одного запроса.
+
+    Фазы вкладываются друг в друга, и каждой засчитывается только
+    собственное время: SQL внутри представления попадает в db, а не
+    в view, поэтому сумма фаз не превышает total.
+    """
+
+    def __init__(self):
+        self.durations = OrderedDict()
+        self.counts = OrderedDict()
+        self._stack = []
+
+    def start(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def stop(self):
+        name, started, children = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.durations[name] = (
+            self.durations.get(name, 0.0) + elapsed - children)
+        self.counts[name] = self.counts.get(name, 0) + 1
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def stop_all(self):
+        while self._stack:
+            self.stop()
+
+    def header(self, total):
+        """Значение заголовка Server-Timing, длительности в миллисекундах."""
+        metrics = []
+        for name, seconds in self.durations.items():
+            metric = f'{name};dur={seconds * 1000:.2f}'
+            if name == 'db':
+                metric += f';desc="{self.counts[name]} SQL"'
+            metrics.append(metric)
+        metrics.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(metrics)
+
+    def as_dict(self):
+        return {
+            name: {
+                'ms': round(seconds * 1000, 3),
+                'count': self.counts[name],
+            }
+            for name, seconds in self.durations.items()
+        }
+
+
+def start_timings():
+    """Начинает сбор фаз; возвращает (timings, токен сброса)."""
+    timings = Timings()
+    return timings, _timings.set(timings)
+
+
+def reset_timings(token):
+    _timings.reset(token)
+
+
+@contextmanager
+def measure(name):
+    """Засчитывает время блока фазе name текущего запроса, если он есть."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    timings.start(name)
+    try:
+        yield
+    finally:
+        timings.stop()
+
+
+def time_queries(execute, sql, params, many, context):
+    """Обёртка execute_wrapper для фазы db."""
+    with measure('db'):
+        return execute(sql, params, many, context)
+
+
+def timed_processor(processor):
+    """Контекстный процессор, время которого идёт в фазу cp-<имя>."""
+    name = f'cp-{processor.__name__}'
+
+    @wraps(processor)
+    def wrapper(request):
+        with measure(name):
+            return processor(request)
+    return wrapper
+
+
+def log_timings(request, response, timings, total):
+    logger.info(json.dumps({
+        'method': request.method,
+        'path': request.path,
+        'view': getattr(request.resolver_match, 'view_name', None),
+        'status': response.status_code,
+        'total_ms': round(total * 1000, 3),
+        'phases': timings.as_dict(),
+    }, ensure_ascii=False))
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with measure('tpl'):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Шаблонизатор Django, который отдаёт время рендеринга в фазу tpl,
+    а время каждого контекстного процессора - в свою фазу cp-<имя>.
+    """
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.engine.template_context_processors = tuple(
+            timed_processor(processor)
+            for processor in self.engine.template_context_processors
+        )
+
+    def from_string(self, template_code):
+        return TimedTemplate(
+            super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(
+            super().get_template(template_name).template, self)
@@ -0,0 +1,16 @@
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Применяет SQLITE_PRAGMAS к каждому новому соединению SQLite.
+
+    WAL позволяет читателям работать параллельно с писателем,
+    synchronous=NORMAL в режиме WAL не теряет целостность базы,
+    а busy_timeout заставляет писателей ждать блокировку, а не падать
+    с «database is locked».
+    """
+    if connection.vendor != 'sqlite' or not settings.SQLITE_PRODUCTION:
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
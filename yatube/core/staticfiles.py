@@ -0,0 +1,154 @@
+import gzip
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+ENCODINGS = (
+    ('br', '.br'),
+    ('gzip', '.gz'),
+)
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age={}, immutable'
+
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content)
+    return gzip.compress(content, mtime=0)
+
+
+def available_encodings():
+    return [
+        (encoding, suffix) for encoding, suffix in ENCODINGS
+        if encoding != 'br' or brotli is not None
+    ]
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хранилище со статикой под хешированными именами и готовыми
+    сжатыми копиями.
+
+    После обычной обработки collectstatic рядом с каждым текстовым
+    файлом из STATIC_COMPRESS_EXTENSIONS кладёт .gz и, если установлен
+    brotli, .br. Копия сохраняется, только если она меньше оригинала.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.compressible_names(paths):
+            for path in self.compress_file(name):
+                yield name, path, True
+
+    def compressible_names(self, paths):
+        """Исходные имена и их хешированные версии, которые стоит сжать."""
+        names = set()
+        for name in paths:
+            if not self.is_compressible(name):
+                continue
+            names.add(name)
+            hashed_name = self.hashed_files.get(self.hash_key(name))
+            if hashed_name:
+                names.add(hashed_name)
+        return sorted(names)
+
+    def is_compressible(self, name):
+        extension = os.path.splitext(name)[1].lower()
+        return extension in settings.STATIC_COMPRESS_EXTENSIONS
+
+    def compress_file(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < settings.STATIC_COMPRESS_MIN_SIZE:
+            return
+        for encoding, suffix in available_encodings():
+            compressed = compress(content, encoding)
+            if len(compressed) >= len(content):
+                continue
+            path = name + suffix
+            if self.exists(path):
+                self.delete(path)
+            self._save(path, ContentFile(compressed))
+            yield path
+
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+
+
+def is_hashed(path):
+    """Имя вида name.<12 hex>.ext, выданное ManifestStaticFilesStorage."""
+    return HASHED_NAME.search(path) is not None
+
+
+def accepted_encodings(request):
+    """Кодировки из Accept-Encoding, кроме отключённых через q=0."""
+    accepted = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        try:
+            quality = float(dict(
+                param.split('=', 1) for param in params if '=' in param
+            ).get('q', 1))
+        except ValueError:
+            continue
+        if coding and quality > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def serve(request, path):
+    """Отдаёт файл из STATIC_ROOT, выбирая сжатую копию по Accept-Encoding.
+
+    Файлы с хешем в имени получают Cache-Control с immutable на
+    STATIC_MAX_AGE секунд: при изменении файла меняется и имя.
+    Остальные браузер перепроверяет по Last-Modified.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = safe_join(settings.STATIC_ROOT, path)
+    if not os.path.isfile(fullpath):
+        raise Http404('Файл не найден')
+    content_type, _ = mimetypes.guess_type(fullpath)
+    accepted = accepted_encodings(request)
+    encoding = None
+    for candidate, suffix in ENCODINGS:
+        if candidate in accepted and os.path.isfile(fullpath + suffix):
+            encoding = candidate
+            fullpath += suffix
+            break
+    statobj = os.stat(fullpath)
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'),
+        statobj.st_mtime, statobj.st_size,
+    ):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            open(fullpath, 'rb'),
+            content_type=content_type or 'application/octet-stream')
+        response['Last-Modified'] = http_date(statobj.st_mtime)
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    if is_hashed(path):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL.format(
+            settings.STATIC_MAX_AGE)
+    else:
+        response['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+    return response
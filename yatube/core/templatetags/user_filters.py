@@ -7,3 +7,18 @@ register = template.Library()
 @register.filter
 def addclass(field, css):
     return field.as_widget(attrs={'class': css})
+
+
+@register.filter
+def elided_page_range(paginator, number):
+    """Окно номеров страниц вокруг number для блока ссылок."""
+    return paginator.get_elided_page_range(number)
+
+
+@register.simple_tag(takes_context=True)
+def query_with(context, **kwargs):
+    """Строка запроса текущей страницы с заменёнными параметрами."""
+    query = context['request'].GET.copy()
+    for key, value in kwargs.items():
+        query[key] = value
+    return query.urlencode()
@@ -0,0 +1,22 @@
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from .query_budget import get_query_budget
+
+
+def assert_within_query_budget(client, url, method='get', **kwargs):
+    """Выполняет запрос и падает, если представление превысило бюджет."""
+    view = resolve(urlsplit(url).path).func
+    budget = get_query_budget(view)
+    assert budget is not None, f'У представления для {url} нет бюджета'
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, **kwargs)
+    queries = [query['sql'] for query in context.captured_queries]
+    assert len(queries) <= budget, (
+        f'{url}: {len(queries)} SQL-запросов при бюджете {budget}:\n'
+        + '\n'.join(queries)
+    )
+    return response
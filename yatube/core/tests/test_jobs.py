@@ -0,0 +1,156 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.jobs import TASKS, enqueue, run_pending, task
+from core.models import Job
+
+User = get_user_model()
+
+calls = []
+
+
+def flaky(payloads):
+    calls.append(len(payloads))
+    return [
+        ValueError('сбой') if payload.get('fail') else None
+        for payload in payloads
+    ]
+
+
+class JobQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+        task('test_flaky', batch_size=3)(flaky)
+        self.addCleanup(TASKS.pop, 'test_flaky', None)
+
+    def test_jobs_run_in_batches_and_are_removed(self):
+        """Задачи одного вида выполняются пачками и удаляются."""
+        for number in range(7):
+            enqueue('test_flaky', {'number': number})
+        self.assertEqual(run_pending(), 7)
+        self.assertEqual(calls, [3, 3, 1])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_later_then_marked_failed(self):
+        """Упавшая задача откладывается, а после предела попыток - fails."""
+        job = enqueue('test_flaky', {'fail': True}, max_attempts=2)
+        self.assertEqual(run_pending(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('сбой', job.last_error)
+        run_pending()
+        self.assertEqual(calls, [1])
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('core.jobs', 'ERROR') as logs:
+            run_pending()
+        self.assertIn('test_flaky', logs.output[0])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_expired_claim_is_taken_again(self):
+        """Задачу упавшего обработчика забирают после истечения аренды."""
+        job = enqueue('test_flaky', {})
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING, claimed_by='dead',
+            locked_until=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(run_pending(), 0)
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(run_pending(), 1)
+
+    def test_lease_is_renewed_for_each_batch(self):
+        """Аренда продлевается перед каждой пачкой, а не только при захвате."""
+        leases = []
+
+        def slow(payloads):
+            now = timezone.now()
+            leases.append(Job.objects.filter(
+                status=Job.RUNNING, locked_until__gt=now,
+                payload__in=[f'{{"number": {payload["number"]}}}'
+                             for payload in payloads]).count())
+            Job.objects.update(locked_until=now - timedelta(seconds=1))
+            return [None] * len(payloads)
+
+        task('test_slow', batch_size=2)(slow)
+        self.addCleanup(TASKS.pop, 'test_slow', None)
+        for number in range(5):
+            enqueue('test_slow', {'number': number})
+        self.assertEqual(run_pending(), 5)
+        self.assertEqual(leases, [2, 2, 1])
+
+    def test_reclaimed_batch_is_left_to_new_owner(self):
+        """Задачи, перехваченные другим обработчиком, не трогаются."""
+        def stolen(payloads):
+            calls.append(len(payloads))
+            Job.objects.update(
+                claimed_by='other',
+                locked_until=timezone.now() + timedelta(minutes=1))
+            return [ValueError('сбой'), None, None][:len(payloads)]
+
+        task('test_stolen', batch_size=3)(stolen)
+        self.addCleanup(TASKS.pop, 'test_stolen', None)
+        for number in range(5):
+            enqueue('test_stolen', {'number': number})
+        self.assertEqual(run_pending(), 0)
+        self.assertEqual(calls, [3])
+        self.assertEqual(
+            Job.objects.filter(
+                claimed_by='other', status=Job.RUNNING, attempts=0).count(),
+            5)
+
+    def test_unknown_task_is_rejected(self):
+        """В очередь нельзя поставить незарегистрированную задачу."""
+        self.assertNotIn('missing', TASKS)
+        with self.assertRaises(ValueError):
+            enqueue('missing', {})
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    QUEUED_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class QueuedEmailTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='some_user', email='user@example.com',
+            password='password')
+
+    def test_password_reset_email_is_sent_by_worker(self):
+        """Письмо сброса пароля уходит из очереди, а не из запроса."""
+        response = Client().post(
+            reverse('users:password_reset_form'),
+            {'email': 'user@example.com'})
+        self.assertRedirects(response, reverse('users:password_reset_done'))
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Job.objects.filter(name='send_email').count(), 1)
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['user@example.com'])
+        self.assertIn('/auth/reset/', mail.outbox[0].body)
+
+    def test_message_survives_queue(self):
+        """Альтернативы, копии и вложения письма сохраняются в очереди."""
+        message = mail.EmailMultiAlternatives(
+            'Тема', 'Текст', 'from@example.com', ['to@example.com'],
+            cc=['cc@example.com'], headers={'X-Test': '1'})
+        message.attach_alternative('<p>Текст</p>', 'text/html')
+        message.attach('note.txt', 'Вложение', 'text/plain')
+        message.send()
+        run_pending()
+        sent = mail.outbox[0]
+        self.assertEqual(sent.subject, 'Тема')
+        self.assertEqual(sent.cc, ['cc@example.com'])
+        self.assertEqual(sent.extra_headers, {'X-Test': '1'})
+        self.assertEqual(sent.alternatives, [('<p>Текст</p>', 'text/html')])
+        self.assertEqual(
+            sent.attachments, [('note.txt', 'Вложение', 'text/plain')])
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class StatsViewTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(
+            username='staff', is_staff=True)
+        cls.user = User.objects.create_user(username='some_user')
+
+    def test_staff_reads_process_counters(self):
+        """Сотрудник видит счётчики запросов, кэшей поиска и лимитов."""
+        client = Client()
+        client.force_login(self.staff)
+        client.get(reverse('posts:index'))
+        response = client.get(reverse('stats'))
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()
+        for name in ('pid', 'queries', 'lookups', 'rate_limits'):
+            self.assertIn(name, stats)
+        self.assertIn('posts:index', stats['queries'])
+        self.assertIn('authors_by_username', stats['lookups'])
+
+    def test_other_users_are_redirected(self):
+        """Обычный пользователь и аноним счётчиков не видят."""
+        client = Client()
+        client.force_login(self.user)
+        for client in (Client(), client):
+            with self.subTest(client=client):
+                response = client.get(reverse('stats'))
+                self.assertEqual(response.status_code, 302)
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.query_budget import get_query_stats, reset_query_stats
+from core.testing import assert_within_query_budget
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        reset_query_stats()
+        self.unauthorized_user = Client()
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
+        self.read_urls = [
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=1',
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={
+                'username': self.user.username}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}),
+        ]
+
+    def test_read_views_within_budget(self):
+        """Страницы чтения укладываются в бюджет запросов."""
+        for client in (self.unauthorized_user, self.authorized_user):
+            for url in self.read_urls:
+                with self.subTest(url=url):
+                    cache.clear()
+                    assert_within_query_budget(client, url)
+
+    def test_write_views_within_budget(self):
+        """Создание и редактирование записи укладываются в бюджет."""
+        urls = [
+            reverse('posts:post_create'),
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                assert_within_query_budget(self.authorized_user, url)
+                assert_within_query_budget(
+                    self.authorized_user, url, method='post',
+                    data={'text': 'Новый текст', 'group': self.group.id})
+
+    def test_middleware_records_stats_by_url_name(self):
+        """Middleware собирает число запросов по имени URL."""
+        self.authorized_user.get(self.read_urls[-1])
+        stats = get_query_stats()['posts:post_detail']
+        self.assertEqual(stats['requests'], 1)
+        self.assertGreater(stats['queries'], 0)
+        self.assertGreater(stats['db_time'], 0)
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.ratelimit import get_rate_limit_stats, reset_rate_limit_stats
+
+
+@override_settings(RATE_LIMITS={
+    'login': {'ip': (2, 60), 'username': (3, 60)},
+    'signup': {'ip': (1, 60)},
+    'password_reset': {'ip': (10, 60), 'email': (1, 60)},
+})
+class RateLimitTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_rate_limit_stats()
+        self.client = Client()
+
+    def login(self, username='some_user', ip='10.0.0.1'):
+        return self.client.post(
+            reverse('users:login'),
+            {'username': username, 'password': 'wrong'},
+            REMOTE_ADDR=ip)
+
+    def test_ip_bucket_rejects_with_retry_after(self):
+        """Лишняя попытка с одного адреса получает 429 и Retry-After."""
+        self.assertEqual(self.login('first').status_code, 200)
+        self.assertEqual(self.login('second').status_code, 200)
+        response = self.login('third')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertEqual(self.login('third', ip='10.0.0.2').status_code, 200)
+        self.assertEqual(
+            self.client.get(
+                reverse('users:login'), REMOTE_ADDR='10.0.0.1').status_code,
+            200)
+
+    def test_username_bucket_spans_addresses(self):
+        """Перебор пароля одного пользователя с разных адресов ограничен."""
+        for number in range(3):
+            self.assertEqual(
+                self.login('Some_User', ip=f'10.0.1.{number}').status_code,
+                200)
+        self.assertEqual(
+            self.login('some_user', ip='10.0.1.9').status_code, 429)
+
+    def test_rejected_requests_skip_expensive_work(self):
+        """Отклонённые запросы не проверяют пароль и не шлют писем."""
+        self.login()
+        self.login()
+        with mock.patch('django.contrib.auth.forms.authenticate') as auth:
+            self.assertEqual(self.login().status_code, 429)
+        auth.assert_not_called()
+        reset_url = reverse('users:password_reset_form')
+        self.client.post(reset_url, {'email': 'user@example.com'})
+        self.assertEqual(
+            self.client.post(
+                reset_url, {'email': 'USER@example.com'}).status_code,
+            429)
+        self.assertEqual(len(mail.outbox), 0)
+        signup_url = reverse('users:signup')
+        self.client.post(signup_url, {})
+        self.assertEqual(self.client.post(signup_url, {}).status_code, 429)
+        self.assertEqual(get_rate_limit_stats(), {
+            'login': 1, 'password_reset': 1, 'signup': 1})
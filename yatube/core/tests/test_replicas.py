@@ -0,0 +1,197 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import (Client, RequestFactory, SimpleTestCase, TestCase,
+                         TransactionTestCase, override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from about.views import AboutAuthorView
+from core.middleware import ReplicaRoutingMiddleware
+from core.replicas import PrimaryReplicaRouter, reading_from_replica
+from posts import views
+from posts.lookups import clear_lookup_caches
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_go_to_replica_only_when_allowed(self):
+        """Чтения уходят в реплику только внутри reading_from_replica."""
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+        with reading_from_replica():
+            self.assertEqual(self.router.db_for_read(Post), 'replica')
+            self.assertEqual(self.router.db_for_read(User), 'replica')
+            self.assertEqual(self.router.db_for_read(Session), 'default')
+            self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_replicas_are_not_migrated(self):
+        """Миграции применяются только к основной базе."""
+        self.assertTrue(self.router.allow_migrate('default', 'posts'))
+        self.assertFalse(self.router.allow_migrate('replica', 'posts'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+
+    def read_alias(self, request, view):
+        """База, из которой читает представление view на запросе."""
+        aliases = []
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            aliases.append(self.router.db_for_read(Post))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        response = middleware(request)
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+        return aliases[0], response
+
+    def test_read_only_views_use_replica(self):
+        """Страницы чтения идут в реплику, остальные - в основную базу."""
+        view_list = [
+            (views.index, 'replica'),
+            (views.group_posts, 'replica'),
+            (views.profile, 'replica'),
+            (views.post_detail, 'replica'),
+            (AboutAuthorView.as_view(), 'replica'),
+            (views.post_create, 'default'),
+            (views.search, 'default'),
+        ]
+        for view, alias in view_list:
+            with self.subTest(view=view):
+                self.assertEqual(
+                    self.read_alias(self.factory.get('/'), view)[0], alias)
+
+    def test_writes_pin_author_to_primary(self):
+        """После записи автор читает из основной базы."""
+        alias, response = self.read_alias(
+            self.factory.post('/'), views.post_create)
+        self.assertEqual(alias, 'default')
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_STICKY_SECONDS)
+        request = self.factory.get('/')
+        request.COOKIES[settings.REPLICA_PIN_COOKIE] = cookie.value
+        self.assertEqual(self.read_alias(request, views.index)[0], 'default')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaPinCookieTest(TestCase):
+    def test_post_create_sets_pin_cookie(self):
+        """Создание записи через сайт ставит куку привязки."""
+        client = Client()
+        client.force_login(User.objects.create_user(username='some_user'))
+        response = client.post(
+            reverse('posts:post_create'), {'text': 'Новый пост'})
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+
+@skipUnless('replica' in settings.DATABASES, 'Реплика не настроена')
+class ReplicaReadTest(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='some_user')
+        self.post = Post.objects.create(text='Тестовый текст', author=user)
+
+    def test_feed_is_read_from_replica(self):
+        """Лента читается через соединение реплики."""
+        with CaptureQueriesContext(connections['replica']) as context:
+            response = self.client.get(reverse('posts:index'))
+        self.assertIn(self.post, response.context['page_obj'])
+        self.assertTrue(any(
+            'posts_post' in query['sql']
+            for query in context.captured_queries))
+
+    def test_open_transaction_reads_primary(self):
+        """Внутри транзакции основной базы зеркало не используется."""
+        router = PrimaryReplicaRouter()
+        with reading_from_replica():
+            self.assertEqual(router.db_for_read(Post), 'replica')
+            with transaction.atomic():
+                self.assertEqual(router.db_for_read(Post), 'default')
+
+
+FILE_REPLICA = 'file_replica'
+
+
+@override_settings(DATABASE_REPLICAS=[FILE_REPLICA])
+class SyncedReplicaTest(TransactionTestCase):
+    """Реплика - отдельный файл SQLite, который обновляет sync_replica."""
+
+    databases = {'default', FILE_REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        connections.databases[FILE_REPLICA] = {
+            'ENGINE': 'core.backends.sqlite3',
+            'NAME': os.path.join(cls.directory, 'replica.sqlite3'),
+        }
+        connections.ensure_defaults(FILE_REPLICA)
+        connections.prepare_test_settings(FILE_REPLICA)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[FILE_REPLICA].close()
+        del connections.databases[FILE_REPLICA]
+        if hasattr(connections._connections, FILE_REPLICA):
+            delattr(connections._connections, FILE_REPLICA)
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        clear_lookup_caches()
+        self.user = User.objects.create_user(username='some_user')
+        Post.objects.create(text='Первый пост', author=self.user)
+        self.sync_replica()
+
+    def sync_replica(self):
+        call_command('sync_replica', stdout=StringIO())
+
+    def test_lagging_replica_is_refreshed_by_sync(self):
+        """До sync_replica лента отстаёт, после - кэш и ETag сброшены."""
+        url = reverse('posts:index')
+        with CaptureQueriesContext(connections[FILE_REPLICA]) as context:
+            self.assertContains(Client().get(url), 'Первый пост')
+        self.assertTrue(any(
+            'posts_post' in query['sql']
+            for query in context.captured_queries))
+        Post.objects.create(text='Второй пост', author=self.user)
+        response = Client().get(url)
+        self.assertNotContains(response, 'Второй пост')
+        etag = response['ETag']
+        self.sync_replica()
+        response = Client().get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Второй пост')
+
+    def test_feed_totals_come_from_primary(self):
+        """Итог ленты считается по основной базе даже при чтении реплики."""
+        Post.objects.create(text='Второй пост', author=self.user)
+        response = Client().get(reverse('posts:index'), {'page': 1})
+        self.assertEqual(response.context['page_obj'].paginator.count, 2)
+        self.assertEqual(len(response.context['page_obj']), 1)
@@ -0,0 +1,89 @@
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.server_timing import measure, reset_timings, start_timings
+from posts.models import Post
+
+User = get_user_model()
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+@override_settings(SERVER_TIMING=True)
+class ServerTimingTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        Post.objects.create(text='Тестовый текст', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_pages_report_phases(self):
+        """Страницы posts, users и about отдают фазы в Server-Timing."""
+        reverse_name_list = [
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': 'some_user'}),
+            reverse('posts:post_create'),
+            reverse('login'),
+            reverse('about:author'),
+        ]
+        for reverse_name in reverse_name_list:
+            with self.subTest(reverse_name=reverse_name):
+                response = self.authorized_client.get(reverse_name)
+                metrics = parse_server_timing(response['Server-Timing'])
+                for name in ('view', 'tpl', 'cp-year', 'total'):
+                    self.assertIn(name, metrics)
+                    self.assertGreaterEqual(float(metrics[name]['dur']), 0)
+
+    def test_db_phase_counts_queries(self):
+        """Фаза db показывает число SQL-запросов."""
+        response = self.authorized_client.get(
+            reverse('posts:profile', kwargs={'username': 'some_user'}))
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertRegex(metrics['db']['desc'], r'^"\d+ SQL"$')
+
+    @override_settings(SERVER_TIMING=False)
+    def test_header_can_be_disabled(self):
+        """Без SERVER_TIMING заголовок не отдаётся."""
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(SERVER_TIMING=False, SERVER_TIMING_LOG=True)
+    def test_timings_are_logged(self):
+        """При SERVER_TIMING_LOG фазы пишутся в лог JSON-строкой."""
+        with self.assertLogs('core.server_timing', 'INFO') as logs:
+            self.authorized_client.get(reverse('posts:index'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'posts:index')
+        self.assertEqual(record['status'], 200)
+        self.assertIn('tpl', record['phases'])
+
+
+class TimingsTest(TestCase):
+    def test_nested_phase_time_is_exclusive(self):
+        """Время вложенной фазы не засчитывается внешней."""
+        timings, token = start_timings()
+        self.addCleanup(reset_timings, token)
+        with measure('view'):
+            with measure('db'):
+                time.sleep(0.05)
+            with measure('db'):
+                pass
+        self.assertEqual(timings.counts, {'db': 2, 'view': 1})
+        self.assertGreaterEqual(timings.durations['db'], 0.05)
+        self.assertLess(timings.durations['view'], 0.05)
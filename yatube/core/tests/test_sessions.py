@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class CachedSessionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+
+    def setUp(self):
+        cache.clear()
+
+    def session_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        return [
+            query for query in context.captured_queries
+            if 'django_session' in query['sql']
+        ]
+
+    def test_pages_do_not_read_session_table(self):
+        """Сессия читается из кэша, а аноним не трогает её вовсе."""
+        authorized_user = Client()
+        authorized_user.force_login(self.user)
+        reverse_name_list = [
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': 'some_user'}),
+            reverse('about:author'),
+        ]
+        for reverse_name in reverse_name_list:
+            for client in (Client(), authorized_user):
+                with self.subTest(reverse_name=reverse_name):
+                    self.assertEqual(
+                        self.session_queries(client, reverse_name), [])
+
+    def test_logout_is_seen_immediately(self):
+        """После выхода старая кука сессии больше не авторизует."""
+        authorized_user = Client()
+        authorized_user.force_login(self.user)
+        session_cookie = authorized_user.cookies['sessionid'].value
+        authorized_user.get(reverse('users:logout'))
+        stale_client = Client()
+        stale_client.cookies['sessionid'] = session_cookie
+        response = stale_client.get(reverse('posts:post_create'))
+        self.assertEqual(response.status_code, 302)
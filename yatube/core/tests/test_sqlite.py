@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.backends.sqlite3.base import DatabaseWrapper
+
+
+class SQLiteProfileTest(TestCase):
+    def open_connection(self):
+        """Новое соединение с отдельным файлом SQLite."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict,
+             'NAME': os.path.join(directory, 'profile.sqlite3')},
+            alias='sqlite_profile',
+        )
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    @override_settings(SQLITE_PRODUCTION=True)
+    def test_new_connection_gets_production_profile(self):
+        """Новое соединение получает WAL, busy_timeout, synchronous
+        и cache_size.
+        """
+        wrapper = self.open_connection()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 20_000)
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -64 * 1024)
+
+    @override_settings(SQLITE_PRODUCTION=False)
+    def test_profile_can_be_disabled(self):
+        """Без SQLITE_PRODUCTION соединение остаётся как есть."""
+        wrapper = self.open_connection()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'delete')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 2)
+
+    @override_settings(
+        SQLITE_PRODUCTION=True, SQLITE_PRAGMAS={'busy_timeout': 1234})
+    def test_pragmas_come_from_settings(self):
+        """Выполняются PRAGMA из SQLITE_PRAGMAS."""
+        wrapper = self.open_connection()
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 1234)
+
+    def begin_statement(self, wrapper):
+        wrapper.ensure_connection()
+        with CaptureQueriesContext(wrapper) as context:
+            wrapper.set_autocommit(
+                False, force_begin_transaction_with_broken_autocommit=True)
+            wrapper.rollback()
+            wrapper.set_autocommit(True)
+        return context.captured_queries[0]['sql']
+
+    def test_transaction_begins_immediate_in_production_profile(self):
+        """С профилем транзакция сразу берёт блокировку записи."""
+        wrapper = self.open_connection()
+        with override_settings(SQLITE_PRODUCTION=True):
+            self.assertEqual(self.begin_statement(wrapper), 'BEGIN IMMEDIATE')
+        with override_settings(SQLITE_PRODUCTION=False):
+            self.assertEqual(self.begin_statement(wrapper), 'BEGIN')
@@ -0,0 +1,95 @@
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import skipUnless
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.staticfiles import brotli
+
+STATIC_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_STORAGE=(
+        'core.staticfiles.CompressedManifestStaticFilesStorage'),
+)
+class CompressedStaticFilesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.hashed_name = staticfiles_storage.stored_name(
+            'css/bootstrap.min.css')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def get_static(self, name, **headers):
+        return self.client.get(f'/static/{name}', **headers)
+
+    def read_hashed(self, suffix=''):
+        path = os.path.join(STATIC_ROOT, self.hashed_name + suffix)
+        with open(path, 'rb') as static_file:
+            return static_file.read()
+
+    def test_collectstatic_writes_hashed_gzip_files(self):
+        """collectstatic кладёт .gz рядом с хешированным файлом."""
+        self.assertRegex(
+            self.hashed_name, r'^css/bootstrap\.min\.[0-9a-f]{12}\.css$')
+        self.assertEqual(
+            gzip.decompress(self.read_hashed('.gz')), self.read_hashed())
+
+    @skipUnless(brotli, 'Brotli не установлен')
+    def test_collectstatic_writes_brotli_files(self):
+        """При установленном Brotli рядом кладётся и .br."""
+        self.assertEqual(
+            brotli.decompress(self.read_hashed('.br')), self.read_hashed())
+
+    def test_binary_files_are_not_compressed(self):
+        """Картинки PNG не сжимаются повторно."""
+        hashed_name = staticfiles_storage.stored_name('img/logo.png')
+        self.assertFalse(
+            os.path.exists(os.path.join(STATIC_ROOT, hashed_name + '.gz')))
+
+    def test_serve_picks_encoding(self):
+        """Сжатая копия выбирается по Accept-Encoding."""
+        cases = [
+            ('gzip, deflate, br', 'br' if brotli else 'gzip'),
+            ('gzip', 'gzip'),
+            ('br;q=0, gzip', 'gzip'),
+            ('', None),
+        ]
+        for accept_encoding, encoding in cases:
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.get_static(
+                    self.hashed_name, HTTP_ACCEPT_ENCODING=accept_encoding)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.get('Content-Encoding'), encoding)
+                self.assertEqual(response['Content-Type'], 'text/css')
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_hashed_files_are_immutable(self):
+        """Хешированные файлы кэшируются надолго, остальные - нет."""
+        response = self.get_static(self.hashed_name)
+        self.assertEqual(
+            response['Cache-Control'],
+            'public, max-age=31536000, immutable')
+        response = self.get_static('css/bootstrap.min.css')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    def test_missing_files_return_404(self):
+        """Несуществующие файлы и каталоги дают 404."""
+        for name in ('css/missing.css', 'css/'):
+            with self.subTest(name=name):
+                self.assertEqual(self.get_static(name).status_code, 404)
+
+    def test_paths_outside_static_root_are_rejected(self):
+        """Путь за пределы STATIC_ROOT не отдаётся."""
+        self.assertEqual(self.get_static('../manage.py').status_code, 400)
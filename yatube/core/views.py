@@ -0,0 +1,14 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from .monitoring import collect_stats
+
+
+@staff_member_required
+def stats(request):
+    """Счётчики процесса, ответившего на запрос, для мониторинга.
+
+    Каждый процесс считает сам, поэтому в ответе есть его pid.
+    """
+    return JsonResponse(
+        collect_stats(), json_dumps_params={'ensure_ascii': False})
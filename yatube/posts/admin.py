@@ -1,6 +1,105 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.contrib.admin.widgets import AutocompleteSelect
 
-from .models import Post, Group
+from .models import Group, Post
+from .paginators import CursorPage, EstimatedCountPaginator
+from .search import search_posts
+
+CURSOR_PARAMS = ('after', 'before')
+
+
+class LoadedAutocompleteSelect(AutocompleteSelect):
+    """Выбор с автодополнением, который подписывает текущее значение
+    уже загруженным объектом loaded, а не отдельным запросом.
+    """
+
+    loaded = None
+
+    def optgroups(self, name, value, attr=None):
+        selected = {
+            str(v) for v in value
+            if str(v) not in self.choices.field.empty_values
+        }
+        if self.loaded is None or selected != {str(self.loaded.pk)}:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        options.append(self.create_option(
+            name, self.loaded.pk,
+            self.choices.field.label_from_instance(self.loaded),
+            True, len(options)))
+        return [(None, options, 0)]
+
+
+class PostChangeListForm(forms.ModelForm):
+    """Строка списка записей: сообщество берётся из list_select_related."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        widget = self.fields['group'].widget
+        widget = getattr(widget, 'widget', widget)
+        if Post.group.is_cached(self.instance):
+            widget.loaded = self.instance.group
+
+
+class PostChangeList(ChangeList):
+    """Список записей, который при сортировке по умолчанию листается
+    по курсору (?after=/?before=) на (pub_date, id) вместо OFFSET.
+
+    Номера страниц остаются для сортировки по колонкам; их число
+    ограничено оценкой итога из EstimatedCountPaginator.
+    """
+
+    def uses_cursor(self):
+        return (
+            ORDER_VAR not in self.params
+            and not self.page_num
+            and not self.show_all
+        )
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        for name in CURSOR_PARAMS:
+            lookup_params.pop(name, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        remove = [*(remove or ()), *CURSOR_PARAMS]
+        return super().get_query_string(new_params, remove)
+
+    def get_results(self, request):
+        self.cursor_page = None
+        if not self.uses_cursor():
+            return super().get_results(request)
+        paginator = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page)
+        rows, has_next, has_previous = paginator.cursor_rows(
+            self.queryset.select_related(None).only('pk', 'pub_date'),
+            request.GET.get('after'), request.GET.get('before'))
+        page = CursorPage(
+            rows, paginator, has_next=has_next, has_previous=has_previous)
+        self.cursor_page = page
+        self.first_page_url = self.get_query_string(remove=[PAGE_VAR])
+        self.next_page_url = self.cursor_url('after', page.next_cursor)
+        self.previous_page_url = self.cursor_url(
+            'before', page.previous_cursor)
+        self.result_list = self.queryset.filter(
+            pk__in=[row.pk for row in rows])
+        self.result_count = paginator.count
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.full_result_count = None
+        self.can_show_all = False
+        self.multi_page = has_next or has_previous
+        self.paginator = paginator
+
+    def cursor_url(self, name, cursor):
+        if cursor is None:
+            return None
+        return self.get_query_string({name: cursor}, remove=[PAGE_VAR])
 
 
 @admin.register(Post)
@@ -13,9 +112,36 @@ class PostAdmin(admin.ModelAdmin):
         'group',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    autocomplete_fields = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
+    def get_changelist_form(self, request, **kwargs):
+        return super().get_changelist_form(
+            request, form=PostChangeListForm, **kwargs)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.get_autocomplete_fields(request):
+            kwargs.setdefault('widget', LoadedAutocompleteSelect(
+                db_field.remote_field, self.admin_site,
+                using=kwargs.get('using')))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
 
-admin.site.register(Group)
+@admin.register(Group)
+class GroupAdmin(admin.ModelAdmin):
+    search_fields = ('title', 'slug')
+    ordering = ('title',)
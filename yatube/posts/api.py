@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
+
+from core.http import make_etag
+from core.query_budget import query_budget
+
+from .feeds import ALL_FEEDS, get_feed_version
+from .lookups import get_author_or_404, get_group_or_404
+from .models import Post
+from .paginators import CursorPage, CursorPaginator
+
+JSON_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+def serialize_post(post):
+    return {
+        'id': post.id,
+        'text': post.text,
+        'pub_date': post.pub_date.isoformat(),
+        'updated_at': post.updated_at.isoformat(),
+        'author': post.author.username,
+        'group': post.group.slug if post.group_id else None,
+    }
+
+
+def not_modified_or_none(request, etag):
+    """Ответ 304, если у клиента уже есть версия с этим ETag."""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+    return response
+
+
+def feed_response(request, queryset):
+    """JSON-страница ленты по курсору с ETag.
+
+    Сначала читаются только id и updated_at записей окна; вместе с
+    общей версией лент ALL_FEEDS они дают ETag. Если он
+    совпал с If-None-Match, клиент получает 304 без загрузки записей.
+    """
+    paginator = CursorPaginator(queryset, settings.POST_PER_PAGE)
+    keys, has_next, has_previous = paginator.get_cursor_keys(
+        request.GET.get('after'), request.GET.get('before'),
+        fields=('pk', 'updated_at'))
+    ids = [key['pk'] for key in keys]
+    newest = max((key['updated_at'] for key in keys), default='')
+    etag = make_etag(
+        ids, newest, has_next, has_previous,
+        get_feed_version(ALL_FEEDS))
+    response = not_modified_or_none(request, etag)
+    if response is not None:
+        return response
+    posts = queryset.select_related('author', 'group').filter(pk__in=ids)
+    posts = sorted(posts, key=lambda post: ids.index(post.pk))
+    page = CursorPage(
+        posts, paginator, has_next=has_next, has_previous=has_previous)
+    response = JsonResponse({
+        'results': [serialize_post(post) for post in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    }, json_dumps_params=JSON_PARAMS)
+    response['ETag'] = etag
+    return response
+
+
+@query_budget(4)
+@require_safe
+def index(request):
+    """Лента всех записей"""
+    return feed_response(request, Post.objects.all())
+
+
+@query_budget(5)
+@require_safe
+def group_posts(request, slug):
+    """Лента сообщества"""
+    group = get_group_or_404(slug)
+    return feed_response(request, Post.objects.filter(group_id=group.id))
+
+
+@query_budget(5)
+@require_safe
+def profile(request, username):
+    """Лента пользователя"""
+    author = get_author_or_404(username)
+    return feed_response(request, Post.objects.filter(author_id=author.id))
+
+
+@query_budget(4)
+@require_safe
+def post_detail(request, post_id):
+    """Одна запись"""
+    updated_at = get_object_or_404(
+        Post.objects.values_list('updated_at', flat=True), pk=post_id)
+    etag = make_etag(post_id, updated_at, get_feed_version(ALL_FEEDS))
+    response = not_modified_or_none(request, etag)
+    if response is not None:
+        return response
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group'), pk=post_id)
+    response = JsonResponse(
+        serialize_post(post), json_dumps_params=JSON_PARAMS)
+    response['ETag'] = etag
+    return response
@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class PostsConfig(AppConfig):
     name = 'posts'
+
+    def ready(self):
+        from core.monitoring import register_stats
+
+        from . import signals  # noqa: F401
+        from .lookups import get_lookup_stats
+        register_stats('lookups', get_lookup_stats)
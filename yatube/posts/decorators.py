@@ -0,0 +1,69 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.http import make_etag
+
+from .feeds import get_page_version, page_cache_key
+
+
+def is_anonymous_read(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        and 'messages' not in request.COOKIES
+    )
+
+
+def resolve_feed(request, get_feed, *args, **kwargs):
+    """Ключ ленты, вычисленный один раз на запрос."""
+    if not hasattr(request, '_feed'):
+        request._feed = get_feed(*args, **kwargs)
+    return request._feed
+
+
+def feed_etag(get_feed):
+    """etag_func для django.views.decorators.http.condition.
+
+    Версия ленты меняется при каждом сохранении и удалении её записей,
+    общая версия ALL_FEEDS - при переименованиях и обновлении реплики,
+    поэтому ETag считается без запросов к таблице записей.
+    """
+    def etag_func(request, *args, **kwargs):
+        feed = resolve_feed(request, get_feed, *args, **kwargs)
+        if feed is None:
+            return None
+        return make_etag(
+            feed, get_page_version(feed), request.user.pk,
+            request.get_full_path())
+    return etag_func
+
+
+def cache_anonymous_feed(get_feed):
+    """Кэширует страницу ленты целиком для анонимных читателей.
+
+    get_feed получает аргументы представления и возвращает ключ ленты
+    из posts.feeds или None, если страницу кэшировать не нужно. Ключ
+    страницы включает версию ленты, поэтому запись, сохранённая в ленте,
+    делает устаревшими только её страницы.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_anonymous_read(request):
+                return view(request, *args, **kwargs)
+            feed = resolve_feed(request, get_feed, *args, **kwargs)
+            if feed is None:
+                return view(request, *args, **kwargs)
+            key = page_cache_key(
+                feed, get_page_version(feed), request.get_full_path())
+            response = cache.get(key)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200 and not response.cookies:
+                    cache.set(
+                        key, response, settings.POST_PAGE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,52 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+EXPORT_FIELDS = ('id', 'text', 'pub_date', 'updated_at', 'author', 'group')
+
+EXPORT_COLUMNS = (
+    'id', 'text', 'pub_date', 'updated_at', 'author__username', 'group__slug',
+)
+
+
+class LineBuffer:
+    """Файлоподобный объект, который возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=2000):
+    """Записи ленты от старых к новым; в памяти не больше одной порции."""
+    rows = queryset.order_by('pub_date', 'id').values_list(*EXPORT_COLUMNS)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(EXPORT_FIELDS, row))
+
+
+def render_csv(rows):
+    writer = csv.writer(LineBuffer())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in row.values()
+        ])
+
+
+def render_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def render_export(queryset, export_format, chunk_size=2000):
+    """Ленивый поток строк выгрузки в формате csv или jsonl."""
+    rows = export_rows(queryset, chunk_size)
+    if export_format == 'csv':
+        return render_csv(rows)
+    return render_jsonl(rows)
@@ -0,0 +1,116 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.replicas import PRIMARY
+
+INDEX_FEED = 'index'
+
+# Версия, общая для всех лент: входит в ETag и ключи закэшированных
+# страниц и меняется, когда устаревают сразу все страницы, - при
+# переименовании автора или сообщества (записи при этом не сохраняются)
+# и после обновления реплики, из которой страницы могли собраться.
+ALL_FEEDS = 'all'
+
+
+def group_feed(group_id):
+    return f'group:{group_id}'
+
+
+def author_feed(author_id):
+    return f'author:{author_id}'
+
+
+def post_feeds(author_id, group_id):
+    """Ленты, в которых показывается запись с таким автором и сообществом."""
+    feeds = [INDEX_FEED, author_feed(author_id)]
+    if group_id is not None:
+        feeds.append(group_feed(group_id))
+    return feeds
+
+
+def version_cache_key(feed):
+    return f'posts:version:{feed}'
+
+
+def page_cache_key(feed, version, path):
+    digest = hashlib.md5(path.encode()).hexdigest()
+    return f'posts:page:{feed}:{version}:{digest}'
+
+
+def count_cache_key(feed):
+    return f'posts:count:{feed}'
+
+
+def estimate_cache_key(feed):
+    return f'posts:estimate:{feed}'
+
+
+def change_feed_counts(feeds, delta):
+    """Сдвигает закэшированные итоги лент; оценки просто сбрасывает."""
+    for feed in feeds:
+        try:
+            cache.incr(count_cache_key(feed), delta)
+        except ValueError:
+            pass
+    cache.delete_many([estimate_cache_key(feed) for feed in feeds])
+
+
+def get_cached_count(feed, queryset):
+    """Точное число записей ленты из кэша или из основной базы.
+
+    Итог потом сдвигают incr из сигналов, поэтому он считается не по
+    реплике: её отставание осталось бы в кэше до истечения ключа.
+    """
+    key = count_cache_key(feed)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.using(PRIMARY).count()
+        cache.add(key, count, settings.POST_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def estimate_count(queryset):
+    """Число строк выборки, посчитанное не дальше POST_COUNT_ESTIMATE_LIMIT."""
+    return queryset.order_by().values('pk')[
+        :settings.POST_COUNT_ESTIMATE_LIMIT].count()
+
+
+def get_estimated_count(feed, queryset):
+    """Число записей ленты, посчитанное не дальше POST_COUNT_ESTIMATE_LIMIT."""
+    key = estimate_cache_key(feed)
+    count = cache.get(key)
+    if count is None:
+        count = estimate_count(queryset.using(PRIMARY))
+        cache.set(key, count, settings.POST_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def get_feed_version(feed):
+    """Текущая версия ленты; вытесненная версия заменяется новой."""
+    key = version_cache_key(feed)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_page_version(feed):
+    """Версия страниц ленты: её собственная и общая ALL_FEEDS."""
+    return f'{get_feed_version(feed)}.{get_feed_version(ALL_FEEDS)}'
+
+
+def bump_feed_versions(feeds):
+    """Делает устаревшими все закэшированные страницы этих лент.
+
+    Другие процессы увидят новую версию, только если кэш default у них
+    общий (см. CACHES в настройках).
+    """
+    for feed in feeds:
+        try:
+            cache.incr(version_cache_key(feed))
+        except ValueError:
+            pass
@@ -0,0 +1,197 @@
+import csv
+import json
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .feeds import bump_feed_versions, change_feed_counts, post_feeds
+from .models import (Group, ImportProgress, Post, PostCounter,
+                     render_excerpt)
+
+User = get_user_model()
+
+
+def read_records(path, file_format=None):
+    """Построчно читает записи из JSONL или CSV, не загружая файл целиком.
+
+    Вместо испорченной строки JSONL отдаётся None, чтобы номера строк
+    в сохранённом прогрессе не сдвигались.
+    """
+    if file_format is None:
+        file_format = 'csv' if path.endswith('.csv') else 'jsonl'
+    with open(path, newline='', encoding='utf-8') as source:
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            if line.strip():
+                yield parse_json_record(line)
+
+
+def parse_json_record(line):
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def is_name(value):
+    """Непустая строка, годная в username или slug."""
+    return isinstance(value, str) and bool(value.strip())
+
+
+def read_progress(source):
+    """Число строк источника, импортированных прошлыми запусками."""
+    return ImportProgress.objects.filter(source=source).values_list(
+        'records', flat=True).first() or 0
+
+
+def clear_progress(source):
+    ImportProgress.objects.filter(source=source).delete()
+
+
+def insert_posts(posts, batch_size):
+    """Вставляет записи пачками executemany со значениями полей как есть.
+
+    В отличие от bulk_create здесь не вызывается pre_save, поэтому
+    auto_now_add и auto_now не заменяют даты из файла текущим временем.
+    """
+    fields = [
+        field for field in Post._meta.concrete_fields
+        if not field.primary_key
+    ]
+    quote_name = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote_name(Post._meta.db_table),
+        ', '.join(quote_name(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+    )
+    rows = [
+        [field.get_db_prep_save(getattr(post, field.attname), connection)
+         for field in fields]
+        for post in posts
+    ]
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[start:start + batch_size])
+
+
+def parse_pub_date(value):
+    """Дата из ISO-строки в том виде, в каком её хранит проект."""
+    if not value:
+        return timezone.now()
+    pub_date = datetime.fromisoformat(value)
+    if settings.USE_TZ and timezone.is_naive(pub_date):
+        return timezone.make_aware(pub_date)
+    if not settings.USE_TZ and timezone.is_aware(pub_date):
+        return timezone.make_naive(pub_date)
+    return pub_date
+
+
+class PostImporter:
+    """Потоковый импорт записей пачками executemany.
+
+    Авторы и сообщества сопоставляются по словарям username -> id и
+    slug -> id, загруженным один раз. Каждая порция из chunk_size строк
+    пишется в своей транзакции вместе с числом прочитанных строк в
+    ImportProgress, так что прерванный импорт продолжается ровно с
+    первой незаписанной порции.
+    """
+
+    def __init__(self, batch_size=1000, chunk_size=10_000,
+                 create_missing=False):
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.create_missing = create_missing
+        self.authors = dict(User.objects.values_list('username', 'id'))
+        self.groups = dict(Group.objects.values_list('slug', 'id'))
+        self.imported = 0
+        self.skipped = 0
+        self.bad_lines = 0
+
+    def author_id(self, username):
+        if not is_name(username):
+            return None
+        if username not in self.authors and self.create_missing:
+            author = User.objects.create(username=username, password='!')
+            self.authors[username] = author.id
+        return self.authors.get(username)
+
+    def group_id(self, slug):
+        if not is_name(slug):
+            return None
+        if slug not in self.groups and self.create_missing:
+            group = Group.objects.create(
+                title=slug, slug=slug, description='')
+            self.groups[slug] = group.id
+        return self.groups.get(slug)
+
+    def build_post(self, record):
+        author_id = self.author_id(record.get('author'))
+        group_slug = record.get('group')
+        group_id = self.group_id(group_slug)
+        if not record.get('text') or author_id is None or (
+                group_slug not in (None, '') and group_id is None):
+            return None
+        try:
+            pub_date = parse_pub_date(record.get('pub_date'))
+        except ValueError:
+            return None
+        return Post(
+            text=record['text'],
+            excerpt=render_excerpt(record['text']),
+            author_id=author_id,
+            group_id=group_id,
+            pub_date=pub_date,
+            updated_at=pub_date,
+        )
+
+    def import_chunk(self, records, source=None, done=0):
+        posts = []
+        for record in records:
+            if record is None:
+                self.bad_lines += 1
+                self.skipped += 1
+                continue
+            post = self.build_post(record)
+            if post is None:
+                self.skipped += 1
+            else:
+                posts.append(post)
+        authors = Counter(post.author_id for post in posts)
+        feeds = Counter(
+            feed for post in posts
+            for feed in post_feeds(post.author_id, post.group_id))
+        with transaction.atomic():
+            insert_posts(posts, self.batch_size)
+            for author_id, total in authors.items():
+                PostCounter.objects.add(author_id, total)
+            if source is not None:
+                ImportProgress.objects.update_or_create(
+                    source=source, defaults={'records': done})
+        for feed, total in feeds.items():
+            change_feed_counts([feed], total)
+        bump_feed_versions(feeds)
+        self.imported += len(posts)
+
+    def run(self, records, source=None, progress=None):
+        """Импортирует поток записей; возвращает число прочитанных строк.
+
+        С source прогресс хранится в ImportProgress под этим именем.
+        """
+        done = read_progress(source) if source is not None else 0
+        records = islice(records, done, None)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return done
+            done += len(chunk)
+            self.import_chunk(chunk, source, done)
+            if progress is not None:
+                progress(done)
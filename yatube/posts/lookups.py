@@ -0,0 +1,116 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import Http404
+
+from .models import Group
+
+User = get_user_model()
+
+MISSING = object()
+
+
+class LookupCache:
+    """LRU-кэш строк по ключу в памяти процесса с ограничением по времени.
+
+    Хранит не больше maxsize записей, каждая живёт timeout секунд.
+    Отсутствие строки тоже кэшируется, чтобы 404 не ходили в базу.
+    Наружу отдаются копии, поэтому связанные объекты, подгруженные
+    одним запросом, не попадают в кэш.
+    """
+
+    def __init__(self, loader, maxsize, timeout):
+        self.loader = loader
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Объект по ключу или None, если такой строки нет."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+        value = self.loader(key)
+        with self._lock:
+            self._entries[key] = (now + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def invalidate(self, pk, key):
+        """Убирает ключ key, записи объекта pk и кэшированные промахи."""
+        with self._lock:
+            self._entries.pop(key, None)
+            for cached_key, (expires, value) in list(self._entries.items()):
+                if value is None or value.pk == pk:
+                    del self._entries[cached_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+groups_by_slug = LookupCache(
+    lambda slug: Group.objects.filter(slug=slug).first(),
+    settings.LOOKUP_CACHE_SIZE,
+    settings.LOOKUP_CACHE_TIMEOUT,
+)
+
+# Счётчик записей автора сюда не входит: он меняется с каждой записью
+# и читается заново на каждый запрос (PostCounterManager.posts_count).
+authors_by_username = LookupCache(
+    lambda username: User.objects.filter(username=username).first(),
+    settings.LOOKUP_CACHE_SIZE,
+    settings.LOOKUP_CACHE_TIMEOUT,
+)
+
+
+def get_group_or_404(slug):
+    group = groups_by_slug.get(slug)
+    if group is None:
+        raise Http404('Сообщество не найдено')
+    return group
+
+
+def get_author_or_404(username):
+    author = authors_by_username.get(username)
+    if author is None:
+        raise Http404('Пользователь не найден')
+    return author
+
+
+def get_lookup_stats():
+    """Снимок счётчиков попаданий и промахов кэшей поиска."""
+    return {
+        'groups_by_slug': groups_by_slug.stats(),
+        'authors_by_username': authors_by_username.stats(),
+    }
+
+
+def clear_lookup_caches():
+    groups_by_slug.clear()
+    authors_by_username.clear()
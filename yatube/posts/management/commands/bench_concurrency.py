@@ -0,0 +1,165 @@
+import multiprocessing
+import os
+import tempfile
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmark import benchmark_database, summarize
+from posts.seeding import seed_posts
+
+User = get_user_model()
+
+PROFILES = {
+    'default': False,
+    'production': True,
+}
+
+
+# Каждый обработчик - отдельный процесс со своим соединением, как
+# воркеры gunicorn: в одном процессе потоки делят GIL и почти не
+# пересекаются внутри транзакций SQLite.
+processes = multiprocessing.get_context('fork')
+
+
+class Worker(processes.Process):
+    """Процесс, который до остановки повторяет один запрос к сайту.
+
+    Клиент входит на сайт ещё в родительском процессе, а замеры
+    возвращаются через очередь results.
+    """
+
+    def __init__(self, user, request, stop, results):
+        super().__init__(daemon=True)
+        self.client = Client()
+        self.client.force_login(user)
+        self.request = request
+        self.stop = stop
+        self.results = results
+
+    def run(self):
+        samples = []
+        locked = errors = 0
+        try:
+            while not self.stop.is_set():
+                started = time.perf_counter()
+                try:
+                    response = self.request(self.client)
+                except OperationalError as error:
+                    if 'locked' not in str(error):
+                        raise
+                    locked += 1
+                    continue
+                if response.status_code >= 400:
+                    errors += 1
+                    continue
+                samples.append(time.perf_counter() - started)
+        finally:
+            connections.close_all()
+            self.results.put((samples, locked, errors))
+
+
+def create_post(client):
+    """Публикация в одной транзакции, как при ATOMIC_REQUESTS.
+
+    Запрос сначала читает пользователя, потом пишет запись: без
+    BEGIN IMMEDIATE такая транзакция берёт блокировку записи только
+    на INSERT и может упасть с «database is locked», не дождавшись
+    busy_timeout.
+    """
+    with transaction.atomic():
+        return client.post(
+            reverse('posts:post_create'), {'text': 'Новый пост'})
+
+
+def read_index(client):
+    return client.get(reverse('posts:index'))
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает в отдельных процессах авторов post_create и читателей '
+        'ленты на файле SQLite и сравнивает пропускную способность и число '
+        'ошибок «database is locked» для профилей SQLite'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument(
+            '--duration', type=float, default=10, help='Секунд на профиль')
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument(
+            '--profile', choices=PROFILES, action='append', dest='profiles',
+            help='Профиль SQLite; по умолчанию оба')
+
+    def handle(self, *args, **options):
+        for profile in options['profiles'] or PROFILES:
+            with tempfile.TemporaryDirectory() as directory:
+                name = os.path.join(directory, 'bench.sqlite3')
+                with override_settings(SQLITE_PRODUCTION=PROFILES[profile]):
+                    with benchmark_database(name):
+                        seed_posts(
+                            options['posts'],
+                            users=options['writers'] + options['readers'])
+                        result = self.run_profile(options)
+            self.report(profile, result, options['duration'])
+
+    def run_profile(self, options):
+        cache.clear()
+        users = list(User.objects.order_by('pk'))
+        stop = processes.Event()
+        writers = [
+            Worker(user, create_post, stop, processes.Queue())
+            for user in users[:options['writers']]
+        ]
+        readers = [
+            Worker(user, read_index, stop, processes.Queue())
+            for user in users[options['writers']:][:options['readers']]
+        ]
+        connections.close_all()
+        for worker in writers + readers:
+            worker.start()
+        time.sleep(options['duration'])
+        stop.set()
+        result = {
+            'writes': self.collect(writers),
+            'reads': self.collect(readers),
+        }
+        for worker in writers + readers:
+            worker.join()
+        return result
+
+    def collect(self, workers):
+        samples = []
+        locked = errors = 0
+        for worker in workers:
+            worker_samples, worker_locked, worker_errors = worker.results.get()
+            samples += worker_samples
+            locked += worker_locked
+            errors += worker_errors
+        return {
+            'done': len(samples),
+            'locked': locked,
+            'errors': errors,
+            'latency': summarize(samples) if samples else None,
+        }
+
+    def report(self, profile, result, duration):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Профиль {profile}'))
+        for name, stats in result.items():
+            line = (
+                f'  {name:<6} {stats["done"] / duration:8.1f} в секунду  '
+                f'locked {stats["locked"]}  ошибок {stats["errors"]}'
+            )
+            if stats['latency'] is not None:
+                line += (
+                    f'  p50 {stats["latency"]["p50"]:.2f} ms  '
+                    f'p95 {stats["latency"]["p95"]:.2f} ms'
+                )
+            self.stdout.write(line)
@@ -0,0 +1,135 @@
+import json
+import subprocess
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from core.benchmark import benchmark_database, measure, summarize
+from core.query_budget import QueryRecorder
+from posts import urls as posts_urls
+from posts.models import Group, Post
+from posts.seeding import seed_posts
+
+DEFAULT_SCALES = (10_000, 100_000)
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def fetch(client, url, data):
+    """Запрос с чтением потокового ответа до конца."""
+    response = client.get(url, data)
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+class Command(BaseCommand):
+    help = (
+        'Засевает базу записями в нескольких масштабах и измеряет '
+        'задержки p50/p95/p99 и число запросов для каждого URL posts'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, action='append', dest='scales',
+            help='Число записей; можно указать несколько раз')
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument(
+            '--db-name', help='Файл базы для замеров вместо памяти')
+        parser.add_argument('--output', help='Куда сохранить JSON')
+        parser.add_argument(
+            '--compare', help='JSON предыдущего запуска для сравнения')
+
+    def handle(self, *args, **options):
+        results = {}
+        for scale in options['scales'] or DEFAULT_SCALES:
+            with benchmark_database(options['db_name']):
+                seed_posts(
+                    scale, users=options['users'], groups=options['groups'])
+                results[str(scale)] = self.run_scale(options['repeat'])
+            self.report(scale, results[str(scale)])
+        report = {'commit': current_commit(), 'results': results}
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2, sort_keys=True)
+        if options['compare']:
+            with open(options['compare']) as previous:
+                self.compare(json.load(previous), report)
+
+    def target_urls(self, author):
+        """URL каждого маршрута posts с реальными аргументами из базы."""
+        group = Group.objects.annotate(
+            total=Count('posts')).order_by('-total').first()
+        post = author.posts.order_by('pk')[author.posts.count() // 2]
+        values = {
+            'slug': group.slug,
+            'username': author.username,
+            'post_id': post.pk,
+        }
+        extra = {
+            'search': {'q': post.text.split()[0]},
+        }
+        urls = []
+        for pattern in posts_urls.urlpatterns:
+            kwargs = {
+                name: values[name] for name in pattern.pattern.converters
+            }
+            name = f'{posts_urls.app_name}:{pattern.name}'
+            urls.append((name, reverse(name, kwargs=kwargs),
+                         extra.get(pattern.name, {})))
+        middle_page = max(1, Post.objects.count() // 20)
+        urls.append(('posts:index (page N/2)', reverse('posts:index'),
+                     {'page': middle_page}))
+        return urls
+
+    def run_scale(self, repeat):
+        author = Post.objects.first().author
+        client = Client()
+        client.force_login(author)
+        cache.clear()
+        results = {}
+        for name, url, data in self.target_urls(author):
+            recorder = QueryRecorder()
+            with connection.execute_wrapper(recorder):
+                fetch(client, url, data)
+            samples = measure(lambda: fetch(client, url, data), repeat)
+            results[name] = dict(summarize(samples), queries=recorder.count)
+        return results
+
+    def report(self, scale, results):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{scale} записей'))
+        for name, result in results.items():
+            self.stdout.write(
+                f'  {name:<28} p50 {result["p50"]:8.2f} ms  '
+                f'p95 {result["p95"]:8.2f} ms  p99 {result["p99"]:8.2f} ms  '
+                f'запросов {result["queries"]}'
+            )
+
+    def compare(self, previous, current):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Сравнение {previous.get("commit")} -> {current["commit"]}'))
+        for scale, results in current['results'].items():
+            for name, result in results.items():
+                before = previous['results'].get(scale, {}).get(name)
+                if before is None:
+                    continue
+                change = (result['p50'] - before['p50']) / before['p50'] * 100
+                self.stdout.write(
+                    f'  {scale:>8} {name:<28} p50 {change:+7.1f}%  '
+                    f'запросов {before["queries"]} -> {result["queries"]}'
+                )
@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from core.benchmark import benchmark_database, format_summary, measure
+from posts.models import Post
+from posts.seeding import seed_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время отрисовки главной страницы с холодным '
+        'и прогретым кэшем фрагментов записей'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=100)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.run(options['posts'], options['repeat'])
+
+    def run(self, posts, repeat):
+        seed_posts(posts, users=10, groups=5)
+        client = Client()
+        client.force_login(Post.objects.first().author)
+        url = reverse('posts:index')
+
+        def render():
+            client.get(url)
+
+        cold = measure(render, repeat, before=cache.clear)
+        render()
+        warm = measure(render, repeat)
+        self.stdout.write(format_summary('cold', cold))
+        self.stdout.write(format_summary('warm', warm))
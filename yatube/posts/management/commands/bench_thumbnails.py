@@ -0,0 +1,101 @@
+import tempfile
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.test import Client, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from core.benchmark import benchmark_database, measure, summarize
+from posts.models import Post
+from posts.seeding import seed_posts
+from posts.thumbnails import process_pending
+
+PHASES = (
+    ('без картинок', 'none'),
+    ('картинки, миниатюры в очереди', 'pending'),
+    ('картинки, миниатюры готовы', 'ready'),
+)
+
+
+def make_images(count, size=(1600, 1200)):
+    """Сохраняет count разных JPEG в хранилище и возвращает их имена."""
+    names = []
+    for number in range(count):
+        buffer = BytesIO()
+        color = (number * 37 % 256, number * 91 % 256, number * 53 % 256)
+        Image.new('RGB', size, color).save(buffer, 'JPEG')
+        names.append(default_storage.save(
+            f'posts/bench_{number}.jpg', ContentFile(buffer.getvalue())))
+    return names
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержку лент без картинок, с картинками до обработки '
+        'и с готовыми миниатюрами'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--images', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument(
+            '--db-name', help='Файл базы для замеров вместо памяти')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root), \
+                benchmark_database(options['db_name']):
+            seed_posts(
+                options['posts'], users=options['users'],
+                groups=options['groups'])
+            post = Post.objects.select_related('author', 'group').filter(
+                group__isnull=False).first()
+            client = Client()
+            client.force_login(post.author)
+            urls = {
+                'posts:index': reverse('posts:index'),
+                'posts:group_list': reverse(
+                    'posts:group_list', kwargs={'slug': post.group.slug}),
+                'posts:profile': reverse(
+                    'posts:profile',
+                    kwargs={'username': post.author.username}),
+            }
+            results = {}
+            for title, phase in PHASES:
+                self.prepare(phase, options['images'])
+                results[phase] = {
+                    name: summarize(measure(
+                        lambda: client.get(url), options['repeat'],
+                        before=cache.clear))
+                    for name, url in urls.items()
+                }
+                self.report(title, results[phase], results['none'])
+
+    def prepare(self, phase, images):
+        if phase == 'pending':
+            for number, name in enumerate(make_images(images)):
+                Post.objects.annotate(
+                    bucket=F('id') % images,
+                ).filter(bucket=number).update(image=name)
+        elif phase == 'ready':
+            process_pending(500)
+
+    def report(self, title, results, baseline):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, result in results.items():
+            change = (
+                result['p50'] - baseline[name]['p50']
+            ) / baseline[name]['p50'] * 100
+            self.stdout.write(
+                f'  {name:<18} p50 {result["p50"]:7.2f} ms  '
+                f'p95 {result["p95"]:7.2f} ms  p99 {result["p99"]:7.2f} ms  '
+                f'к базовому {change:+6.1f}%'
+            )
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.exporting import EXPORT_FORMATS, render_export
+from posts.models import Group
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает записи сообщества или автора в CSV или JSONL'
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--group', help='slug сообщества')
+        target.add_argument('--author', help='username автора')
+        parser.add_argument(
+            '--format', choices=tuple(EXPORT_FORMATS), default='jsonl')
+        parser.add_argument('--output', help='Файл; по умолчанию stdout')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            if options['group']:
+                owner = Group.objects.get(slug=options['group'])
+            else:
+                owner = User.objects.get(username=options['author'])
+        except (Group.DoesNotExist, User.DoesNotExist):
+            raise CommandError('Сообщество или автор не найдены')
+        lines = render_export(
+            owner.posts.all(), options['format'], options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8',
+                      newline='') as output:
+                output.writelines(lines)
+            return
+        for line in lines:
+            self.stdout.write(line, ending='')
@@ -0,0 +1,60 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.importing import PostImporter, clear_progress, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково импортирует записи из JSONL или CSV с полями '
+        'text, author, group, pub_date'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=('jsonl', 'csv'))
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--chunk-size', type=int, default=10_000)
+        parser.add_argument(
+            '--create-missing', action='store_true',
+            help='Создавать неизвестных авторов и сообщества')
+        parser.add_argument(
+            '--source',
+            help='Имя прогресса импорта в базе; по умолчанию полный путь')
+        parser.add_argument(
+            '--restart', action='store_true',
+            help='Начать сначала, забыв сохранённый прогресс')
+
+    def handle(self, *args, **options):
+        source = options['source'] or os.path.abspath(options['path'])
+        if options['restart']:
+            clear_progress(source)
+        importer = PostImporter(
+            batch_size=options['batch_size'],
+            chunk_size=options['chunk_size'],
+            create_missing=options['create_missing'],
+        )
+        started = time.perf_counter()
+
+        def progress(done):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'Прочитано строк: {done}, импортировано: '
+                f'{importer.imported}, пропущено: {importer.skipped} '
+                f'(испорченных строк: {importer.bad_lines}), '
+                f'{importer.imported / elapsed:.0f} записей/с'
+            )
+
+        done = importer.run(
+            read_records(options['path'], options['format']),
+            source=source,
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: прочитано строк {done}, '
+            f'импортировано {importer.imported}, '
+            f'пропущено {importer.skipped} '
+            f'(испорченных строк {importer.bad_lines})'
+        ))
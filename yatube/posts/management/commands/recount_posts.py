@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import PostCounter
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает хранимое число записей каждого автора'
+
+    def handle(self, *args, **options):
+        PostCounter.objects.recount()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано авторов: {PostCounter.objects.count()}'))
@@ -0,0 +1,36 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from posts.seeding import seed_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, сообществами '
+        'и записями'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        def progress(done):
+            self.stdout.write(f'\r{done}/{options["posts"]}', ending='')
+            self.stdout.flush()
+
+        seed_posts(
+            options['posts'],
+            users=options['users'],
+            groups=options['groups'],
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            progress=progress,
+        )
+        cache.clear()
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'Добавлено записей: {options["posts"]}'))
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.thumbnails import process_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'Фоновый обработчик: строит миниатюры загруженных картинок '
+        'и складывает их в кэш на диске'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Один проход по очереди без ожидания новых картинок')
+        parser.add_argument(
+            '--batch', type=int, default=settings.THUMBNAIL_WORKER_BATCH)
+        parser.add_argument(
+            '--interval', type=float,
+            default=settings.THUMBNAIL_WORKER_INTERVAL,
+            help='Пауза между проходами, секунд')
+
+    def handle(self, *args, **options):
+        while True:
+            done = process_pending(options['batch'])
+            if done:
+                self.stdout.write(f'Готово записей: {done}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.16 on 2026-10-17 05:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def count_posts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    PostCounter = apps.get_model('posts', 'PostCounter')
+    totals = Post.objects.order_by().values('author').annotate(
+        total=models.Count('id'))
+    PostCounter.objects.bulk_create(
+        PostCounter(author_id=row['author'], posts_count=row['total'])
+        for row in totals.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0004_auto_20261017_0556'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostCounter',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_counter', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Число записей')),
+            ],
+            options={
+                'verbose_name': 'Счётчик записей автора',
+                'verbose_name_plural': 'Счётчики записей авторов',
+            },
+        ),
+        migrations.RunPython(count_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 2.2.16 on 2026-10-17 06:15
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr, truncatewords
+
+from posts.search import install_fts
+
+BATCH_SIZE = 500
+
+EXCERPT_WORDS = 50
+
+
+def render_excerpt(text):
+    # Копия posts.models.render_excerpt на момент миграции: миграция
+    # должна заполнять поле так же, даже если функция потом изменится.
+    return truncatewords(linebreaksbr(text), EXCERPT_WORDS)
+
+
+def reinstall_fts(apps, schema_editor):
+    install_fts(schema_editor)
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    batch = []
+    for post in Post.objects.only('id', 'text').iterator(BATCH_SIZE):
+        post.excerpt = render_excerpt(post.text)
+        batch.append(post)
+        if len(batch) == BATCH_SIZE:
+            Post.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    Post.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, help_text='Готовый HTML начала записи для лент', verbose_name='Начало записи'),
+        ),
+        migrations.RunPython(reinstall_fts, migrations.RunPython.noop),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
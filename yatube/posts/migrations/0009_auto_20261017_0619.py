@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-17 06:19
+
+from django.db import migrations, models
+
+from posts.search import install_fts
+
+
+def reinstall_fts(apps, schema_editor):
+    install_fts(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Загрузите картинку', upload_to='posts/', verbose_name='Картинка'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, help_text='Заполняется фоновым обработчиком миниатюр', upload_to='', verbose_name='Миниатюра'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('thumbnail', ''), models.Q(_negated=True, image='')), fields=['id'], name='post_thumbnail_pending_idx'),
+        ),
+        migrations.RunPython(reinstall_fts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 2.2.16 on 2026-10-17 06:44
+
+from django.db import migrations, models
+
+from posts.search import install_fts
+
+
+def reinstall_fts(apps, schema_editor):
+    install_fts(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_auto_20261017_0619'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='thumbnail_attempts',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Неудачных попыток построить миниатюру'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='thumbnail_retry_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Следующая попытка построить миниатюру'),
+        ),
+        migrations.RunPython(reinstall_fts, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,18 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.template.defaultfilters import linebreaksbr, truncatewords
+
+from .feeds import ALL_FEEDS, bump_feed_versions
 
 User = get_user_model()
 
+EXCERPT_WORDS: int = 50
+
+
+def render_excerpt(text):
+    """HTML начала записи для лент: linebreaksbr|truncatewords."""
+    return truncatewords(linebreaksbr(text), EXCERPT_WORDS)
+
 
 class Group(models.Model):
     """Модель сообщества"""
@@ -32,15 +42,30 @@ class Group(models.Model):
 class Post(models.Model):
     """Модель записи"""
     NUMBER_OF_CHAR: int = 15
+    DERIVED_FIELDS: dict = {
+        'text': ('excerpt',),
+        'image': ('thumbnail', 'thumbnail_attempts', 'thumbnail_retry_at'),
+    }
+    TRACKED_FIELDS: tuple = ('author_id', 'group_id', 'image')
 
     text = models.TextField(
         verbose_name='Текст записи',
         help_text='Разместите здесь текст'
     )
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Начало записи',
+        help_text='Готовый HTML начала записи для лент'
+    )
     pub_date = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Дата публикации'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -57,11 +82,187 @@ class Post(models.Model):
         verbose_name='Сообщество',
         help_text='Укажите название сообщества'
     )
+    image = models.ImageField(
+        upload_to='posts/',
+        blank=True,
+        verbose_name='Картинка',
+        help_text='Загрузите картинку'
+    )
+    thumbnail = models.ImageField(
+        blank=True,
+        editable=False,
+        verbose_name='Миниатюра',
+        help_text='Заполняется фоновым обработчиком миниатюр'
+    )
+    thumbnail_attempts = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Неудачных попыток построить миниатюру'
+    )
+    thumbnail_retry_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Следующая попытка построить миниатюру'
+    )
 
     class Meta:
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'id'), name='post_pub_date_id_idx'),
+            models.Index(
+                fields=('group', 'pub_date'), name='post_group_pub_date_idx'),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx'),
+            models.Index(
+                fields=('id',), name='post_thumbnail_pending_idx',
+                condition=models.Q(thumbnail='') & ~models.Q(image='')),
+        )
         verbose_name = 'Запись'
         verbose_name_plural = 'Записи'
 
     def __str__(self):
         return self.text[:self.NUMBER_OF_CHAR]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using, fields)
+        self.remember_loaded_values(fields or self.TRACKED_FIELDS)
+
+    def save(self, *args, **kwargs):
+        self.excerpt = render_excerpt(self.text)
+        if self.image_changed():
+            self.thumbnail = ''
+            self.thumbnail_attempts = 0
+            self.thumbnail_retry_at = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *(
+                derived for name in update_fields
+                for derived in self.DERIVED_FIELDS.get(name, ()))}
+        super().save(*args, **kwargs)
+        self.remember_loaded_values()
+
+    def remember_loaded_values(self, names=TRACKED_FIELDS):
+        """Запоминает автора, сообщество и картинку, сохранённые в базе.
+
+        Поля, которые не загружались (only/defer), помечаются DEFERRED.
+        """
+        values = getattr(self, '_loaded_values', {})
+        for name in names:
+            if name not in self.TRACKED_FIELDS:
+                continue
+            value = self.__dict__.get(name, models.DEFERRED)
+            if name == 'image' and value not in (None, models.DEFERRED):
+                value = str(value)
+            values[name] = value
+        self._loaded_values = values
+
+    def loaded_value(self, name):
+        """Значение поля из базы или None, если оно не загружалось."""
+        value = getattr(self, '_loaded_values', {}).get(name)
+        return None if value is models.DEFERRED else value
+
+    def image_changed(self):
+        """Сменилась ли картинка с момента загрузки из базы.
+
+        Если картинка не загружалась, она сменилась, только когда её
+        присвоили напрямую.
+        """
+        loaded = getattr(self, '_loaded_values', {}).get('image')
+        if loaded is models.DEFERRED:
+            return 'image' in self.__dict__
+        return self.image != loaded
+
+
+class PostCounterManager(models.Manager):
+    def add(self, author_id, delta):
+        """Изменяет счётчик автора; пересчитывает его, если строки нет."""
+        updated = self.filter(author_id=author_id).update(
+            posts_count=models.F('posts_count') + delta)
+        if not updated:
+            self.bulk_create(
+                [self.model(
+                    author_id=author_id,
+                    posts_count=Post.objects.filter(
+                        author_id=author_id).count(),
+                )],
+                ignore_conflicts=True,
+            )
+
+    def posts_count(self, author_id):
+        """Число записей автора по хранимому счётчику."""
+        return self.filter(author_id=author_id).values_list(
+            'posts_count', flat=True).first() or 0
+
+    def subtract(self, author_id):
+        """Уменьшает счётчик, не создавая строку для удаляемого автора."""
+        self.filter(author_id=author_id, posts_count__gt=0).update(
+            posts_count=models.F('posts_count') - 1)
+
+    def recount(self):
+        """Пересчитывает счётчики всех авторов по таблице записей.
+
+        Счётчики выводятся на страницах лент, поэтому закэшированные
+        страницы и их ETag после пересчёта устаревают.
+        """
+        totals = Post.objects.order_by().values('author').annotate(
+            total=models.Count('id'))
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                self.model(author_id=row['author'], posts_count=row['total'])
+                for row in totals.iterator()
+            )
+        bump_feed_versions([ALL_FEEDS])
+
+
+class PostCounter(models.Model):
+    """Хранимое число записей автора"""
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_counter',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число записей'
+    )
+
+    objects = PostCounterManager()
+
+    class Meta:
+        verbose_name = 'Счётчик записей автора'
+        verbose_name_plural = 'Счётчики записей авторов'
+
+    def __str__(self):
+        return f'{self.author_id}: {self.posts_count}'
+
+
+class ImportProgress(models.Model):
+    """Число строк источника, уже импортированных командой import_posts"""
+    source = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Источник'
+    )
+    records = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Прочитано строк'
+    )
+
+    class Meta:
+        verbose_name = 'Прогресс импорта'
+        verbose_name_plural = 'Прогресс импорта'
+
+    def __str__(self):
+        return f'{self.source}: {self.records}'
@@ -0,0 +1,212 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from .feeds import estimate_count, get_cached_count, get_estimated_count
+
+CURSOR_SEPARATOR = '|'
+
+
+def encode_cursor(post):
+    """Непрозрачный курсор для позиции записи в ленте."""
+    value = f'{post.pub_date.isoformat()}{CURSOR_SEPARATOR}{post.pk}'
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Возвращает (pub_date, id) из курсора или None, если он испорчен."""
+    if not cursor:
+        return None
+    try:
+        value = base64.urlsafe_b64decode(
+            cursor + '=' * (-len(cursor) % 4)).decode()
+        pub_date, pk = value.split(CURSOR_SEPARATOR)
+        return datetime.fromisoformat(pub_date), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class CursorPage(Page):
+    """Страница ленты, построенная по курсору, а не по номеру."""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        super().__init__(object_list, None, paginator)
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return encode_cursor(self.object_list[0])
+        return None
+
+
+class WindowPaginator(Paginator):
+    """Пагинатор, который отдаёт ссылкам только окно номеров страниц."""
+
+    ELLIPSIS = '…'
+    on_each_side = 3
+    on_ends = 1
+
+    def get_elided_page_range(self, number=1):
+        """Номера страниц около number, крайние страницы и ELLIPSIS.
+
+        Длина списка не зависит от num_pages, поэтому блок ссылок
+        не растёт вместе с лентой.
+        """
+        number = self.validate_number(number)
+        if self.num_pages <= (self.on_each_side + self.on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > 1 + self.on_each_side + self.on_ends + 1:
+            yield from range(1, self.on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - self.on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - self.on_each_side - self.on_ends - 1:
+            yield from range(number + 1, number + self.on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(
+                self.num_pages - self.on_ends + 1, self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
+
+
+class CursorPaginator(WindowPaginator):
+    """Пагинатор ленты записей.
+
+    Помимо постраничного режима (?page=N) умеет отдавать страницы
+    по курсору (?after=/?before=) с условием на (pub_date, id) вместо
+    OFFSET, поэтому глубокие страницы не дороже первой.
+    """
+
+    def cursor_rows(self, queryset, after=None, before=None):
+        """Строки окна страницы и признаки (has_next, has_previous)."""
+        after = decode_cursor(after)
+        before = decode_cursor(before) if after is None else None
+        if after is not None:
+            pub_date, pk = after
+            rows = list(queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            ).order_by('-pub_date', '-pk')[:self.per_page + 1])
+            return rows[:self.per_page], len(rows) > self.per_page, True
+        if before is not None:
+            pub_date, pk = before
+            rows = list(queryset.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            ).order_by('pub_date', 'pk')[:self.per_page + 1])
+            if len(rows) > self.per_page:
+                return rows[self.per_page - 1::-1], True, True
+        rows = list(
+            queryset.order_by('-pub_date', '-pk')[:self.per_page + 1])
+        return rows[:self.per_page], len(rows) > self.per_page, False
+
+    def get_cursor_page(self, after=None, before=None):
+        """Возвращает страницу после курсора after или перед before."""
+        rows, has_next, has_previous = self.cursor_rows(
+            self.object_list, after, before)
+        return CursorPage(
+            rows, self, has_next=has_next, has_previous=has_previous)
+
+    def get_cursor_keys(self, after=None, before=None, fields=('pk',)):
+        """То же окно, но только значения fields, без загрузки записей."""
+        return self.cursor_rows(
+            self.object_list.values(*fields), after, before)
+
+    count_is_estimate = False
+
+    def get_page(self, number):
+        """Страница по номеру.
+
+        Если итог - оценка, номер за её пределами не прижимается
+        к последней странице: такая страница отдаётся по курсору,
+        а если записей на ней нет - 404.
+        """
+        if self.count_is_estimate:
+            try:
+                deep = int(number) > self.num_pages
+            except (TypeError, ValueError):
+                deep = False
+            if deep:
+                cursor = self.cursor_for_page(int(number))
+                if cursor is None:
+                    raise Http404('Страница не найдена')
+                return self.get_cursor_page(after=cursor)
+        return super().get_page(number)
+
+    def cursor_for_page(self, number):
+        """Курсор after, с которого начинается страница number,
+        или None, если на ней нет записей.
+        """
+        offset = (number - 1) * self.per_page - 1
+        rows = list(self.object_list.select_related(None).order_by(
+            '-pub_date', '-pk').only('pk', 'pub_date')[offset:offset + 2])
+        if len(rows) < 2:
+            return None
+        return encode_cursor(rows[0])
+
+
+class FeedPaginator(CursorPaginator):
+    """Пагинатор ленты, который берёт итоговое число записей из кэша.
+
+    feed - ключ ленты из posts.feeds; без него итог считается как обычно.
+    При POST_COUNT_ESTIMATE итог ограничен POST_COUNT_ESTIMATE_LIMIT.
+    """
+
+    def __init__(self, object_list, per_page, feed=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.feed = feed
+
+    @cached_property
+    def count(self):
+        if self.feed is None:
+            return self.object_list.count()
+        if settings.POST_COUNT_ESTIMATE:
+            return get_estimated_count(self.feed, self.object_list)
+        return get_cached_count(self.feed, self.object_list)
+
+    @property
+    def count_is_estimate(self):
+        return (
+            self.feed is not None
+            and settings.POST_COUNT_ESTIMATE
+            and self.count >= settings.POST_COUNT_ESTIMATE_LIMIT
+        )
+
+
+class EstimatedCountPaginator(CursorPaginator):
+    """Пагинатор, который не считает больше POST_COUNT_ESTIMATE_LIMIT строк.
+
+    Для выборок без ключа ленты, например для списка записей в админке:
+    число страниц ограничено, поэтому и OFFSET по номеру страницы тоже.
+    """
+
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+    @property
+    def count_is_estimate(self):
+        return self.count >= settings.POST_COUNT_ESTIMATE_LIMIT
@@ -0,0 +1,81 @@
+from django.db import connection
+
+FTS_TABLE = 'posts_post_fts'
+
+CREATE_FTS_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "text, content='posts_post', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+
+CREATE_FTS_TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON posts_post BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON posts_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF text ON posts_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END""",
+)
+
+REBUILD_FTS = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+DROP_FTS = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+
+
+def install_fts(schema_editor):
+    """Создаёт индекс FTS5 и триггеры, которые держат его в синхроне.
+
+    Миграции, пересоздающие таблицу posts_post, теряют её триггеры,
+    поэтому после них эту функцию нужно вызвать снова.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_FTS_TABLE)
+    for statement in CREATE_FTS_TRIGGERS:
+        schema_editor.execute(statement)
+    schema_editor.execute(REBUILD_FTS)
+
+
+def uninstall_fts(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_FTS:
+        schema_editor.execute(statement)
+
+
+def fts_query(query):
+    """Запрос FTS5, где каждое слово - отдельная фраза в кавычках."""
+    terms = query.split()
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_posts(queryset, query):
+    """Записи, содержащие все слова запроса, от наиболее релевантных."""
+    match = fts_query(query)
+    if not match:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        for term in query.split():
+            queryset = queryset.filter(text__icontains=term)
+        return queryset
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = posts_post.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+        select={'search_rank': f'{FTS_TABLE}.rank'},
+        order_by=['search_rank', '-pub_date'],
+    )
@@ -0,0 +1,104 @@
+import random
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Max
+from faker import Faker
+
+from .models import Group, Post, PostCounter, render_excerpt
+
+User = get_user_model()
+
+TEXT_POOL_SIZE = 1000
+
+
+def last_pk(model):
+    return model.objects.aggregate(last=Max('pk'))['last'] or 0
+
+
+def next_seed_number(model, field, prefix):
+    """Номер после наибольшего суффикса среди имён prefix<номер>.
+
+    Число строк не годится: после удаления части синтетических записей
+    оно указывает на уже занятое имя.
+    """
+    names = model.objects.filter(
+        **{f'{field}__startswith': prefix}).values_list(field, flat=True)
+    numbers = (name[len(prefix):] for name in names.iterator())
+    return max(
+        (int(number) + 1 for number in numbers if number.isdigit()),
+        default=0,
+    )
+
+
+def seed_posts(posts, users=100, groups=10, batch_size=10_000,
+               seed=0, progress=None):
+    """Быстро заполняет базу синтетическими пользователями и записями.
+
+    Тексты берутся из заранее сгенерированного пула Faker, а записи
+    вставляются пачками через executemany, минуя модели и сигналы,
+    поэтому счётчики авторов пересчитываются в конце. Записи получают
+    только авторов и сообщества, созданные этим вызовом.
+    Возвращает (список id авторов, список id сообществ).
+    """
+    fake = Faker('ru_RU')
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+    texts = [fake.paragraph(nb_sentences=5) for _ in range(TEXT_POOL_SIZE)]
+    texts = [(text, render_excerpt(text)) for text in texts]
+
+    offset = next_seed_number(User, 'username', 'seed_user_')
+    last_id = last_pk(User)
+    User.objects.bulk_create(
+        (User(username=f'seed_user_{offset + number}',
+              first_name=fake.first_name(), last_name=fake.last_name(),
+              password='!')
+         for number in range(users)),
+        batch_size=batch_size,
+    )
+    author_ids = list(User.objects.filter(
+        pk__gt=last_id, username__startswith='seed_user_',
+    ).values_list('id', flat=True))
+    offset = next_seed_number(Group, 'slug', 'seed-group-')
+    last_id = last_pk(Group)
+    Group.objects.bulk_create(
+        (Group(title=f'Сообщество {offset + number}',
+               slug=f'seed-group-{offset + number}',
+               description=fake.sentence())
+         for number in range(groups)),
+        batch_size=batch_size,
+    )
+    group_ids = list(Group.objects.filter(
+        pk__gt=last_id, slug__startswith='seed-group-',
+    ).values_list('id', flat=True))
+
+    table = Post._meta.db_table
+    sql = (
+        f'INSERT INTO {table} (text, excerpt, pub_date, updated_at, '
+        'author_id, group_id, image, thumbnail, thumbnail_attempts) '
+        'VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)'
+    )
+    started = datetime.now() - timedelta(minutes=posts)
+    for batch_start in range(0, posts, batch_size):
+        rows = []
+        for number in range(batch_start, min(posts, batch_start + batch_size)):
+            pub_date = connection.ops.adapt_datetimefield_value(
+                started + timedelta(minutes=number))
+            rows.append((
+                *rng.choice(texts),
+                pub_date,
+                pub_date,
+                rng.choice(author_ids),
+                rng.choice(group_ids) if group_ids and rng.random() < 0.8
+                else None,
+                '',
+                '',
+                0,
+            ))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+        if progress is not None:
+            progress(batch_start + len(rows))
+    PostCounter.objects.recount()
+    return author_ids, group_ids
@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.replicas import replica_synced
+
+from .feeds import (ALL_FEEDS, bump_feed_versions, change_feed_counts,
+                    post_feeds)
+from .lookups import authors_by_username, groups_by_slug
+from .models import Group, Post, PostCounter
+
+User = get_user_model()
+
+# Поля, которые выводятся в подписях записей и на страницах лент.
+LABEL_FIELDS = {
+    User: {'username', 'first_name', 'last_name'},
+    Group: {'title', 'slug', 'description'},
+}
+
+
+def moved_between_feeds(post):
+    """Для изменённой записи - ленты, которые она покинула и пополнила."""
+    old_author_id = post.loaded_value('author_id')
+    if old_author_id is None:
+        return set(), set()
+    old_feeds = set(post_feeds(old_author_id, post.loaded_value('group_id')))
+    new_feeds = set(post_feeds(post.author_id, post.group_id))
+    return old_feeds - new_feeds, new_feeds - old_feeds
+
+
+@receiver(post_save, sender=Post)
+def update_post_counter_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    old_author_id = instance.loaded_value('author_id')
+    if created:
+        PostCounter.objects.add(instance.author_id, 1)
+    elif old_author_id and old_author_id != instance.author_id:
+        PostCounter.objects.subtract(old_author_id)
+        PostCounter.objects.add(instance.author_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def update_post_counter_on_delete(sender, instance, **kwargs):
+    PostCounter.objects.subtract(instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+def update_feed_counts_on_save(sender, instance, created, raw, **kwargs):
+    if created:
+        change_feed_counts(
+            post_feeds(instance.author_id, instance.group_id), 1)
+        return
+    left, joined = moved_between_feeds(instance)
+    change_feed_counts(left, -1)
+    change_feed_counts(joined, 1)
+
+
+@receiver(post_delete, sender=Post)
+def update_feed_counts_on_delete(sender, instance, **kwargs):
+    change_feed_counts(
+        post_feeds(instance.author_id, instance.group_id), -1)
+
+
+@receiver(post_save, sender=Post)
+def bump_feed_versions_on_save(sender, instance, **kwargs):
+    left, joined = moved_between_feeds(instance)
+    bump_feed_versions(
+        set(post_feeds(instance.author_id, instance.group_id)) | left)
+
+
+@receiver(post_delete, sender=Post)
+def bump_feed_versions_on_delete(sender, instance, **kwargs):
+    bump_feed_versions(post_feeds(instance.author_id, instance.group_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Group)
+def bump_labels_version_on_save(sender, instance, created, raw,
+                                update_fields, **kwargs):
+    """Переименование автора или сообщества меняет подписи во всех лентах.
+
+    У нового объекта ещё нет записей, а сохранение одного last_login
+    при входе подписей не касается.
+    """
+    if created or raw:
+        return
+    if update_fields and not LABEL_FIELDS[sender] & set(update_fields):
+        return
+    bump_feed_versions([ALL_FEEDS])
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Group)
+def bump_labels_version_on_delete(sender, instance, **kwargs):
+    bump_feed_versions([ALL_FEEDS])
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_lookup(sender, instance, **kwargs):
+    groups_by_slug.invalidate(instance.pk, instance.slug)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_lookup(sender, instance, **kwargs):
+    authors_by_username.invalidate(instance.pk, instance.username)
+
+
+@receiver(replica_synced)
+def bump_all_feeds_on_replica_sync(sender, **kwargs):
+    """Страницы и итоги, собранные из отстававшей реплики, устаревают."""
+    bump_feed_versions([ALL_FEEDS])
@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+CHANGELIST_URL = reverse('admin:posts_post_changelist')
+
+
+class PostAdminTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass')
+        cls.groups = [
+            Group.objects.create(
+                title=f'Сообщество {number}',
+                slug=f'group-{number}',
+                description='Тестовое описание',
+            )
+            for number in range(20)
+        ]
+        cls.unused_group = cls.groups.pop()
+        authors = [
+            User.objects.create_user(username=f'author_{number}')
+            for number in range(5)
+        ]
+        for number in range(150):
+            Post.objects.create(
+                text=f'Тестовый пост {number}',
+                author=authors[number % 5],
+                group=cls.groups[number % 19] if number % 3 else None,
+            )
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def get_changelist(self, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.admin_client.get(CHANGELIST_URL, params or {})
+        self.assertEqual(response.status_code, 200)
+        queries = [query['sql'] for query in context.captured_queries]
+        return response, queries
+
+    def test_queries_do_not_grow_with_rows(self):
+        """Число запросов не зависит от числа строк на странице."""
+        _, few = self.get_changelist({'pub_date__gte': '2999-01-01'})
+        _, many = self.get_changelist()
+        self.assertLessEqual(len(many) - len(few), 3)
+
+    def test_changelist_does_not_use_offset_or_full_count(self):
+        """Список листается по курсору и не считает все записи."""
+        response, queries = self.get_changelist()
+        self.assertFalse(any('OFFSET' in sql for sql in queries))
+        self.assertFalse(any(
+            sql.startswith('SELECT COUNT(*) AS "__count" FROM "posts_post"')
+            for sql in queries))
+        self.assertEqual(len(response.context['cl'].result_list), 100)
+
+    def test_cursor_pages_cover_all_posts(self):
+        """Ссылки «Следующая» и «Предыдущая» обходят все записи."""
+        response, _ = self.get_changelist()
+        first_page = list(response.context['cl'].result_list)
+        next_url = response.context['cl'].next_page_url
+        response = self.admin_client.get(CHANGELIST_URL + next_url)
+        cl = response.context['cl']
+        second_page = list(cl.result_list)
+        self.assertEqual(len(second_page), 50)
+        self.assertEqual(
+            set(post.pk for post in first_page + second_page),
+            set(Post.objects.values_list('pk', flat=True)))
+        self.assertIsNone(cl.next_page_url)
+        response = self.admin_client.get(
+            CHANGELIST_URL + cl.previous_page_url)
+        self.assertEqual(
+            list(response.context['cl'].result_list), first_page)
+
+    def test_group_select_lists_only_current_group(self):
+        """В строке списка нет <select> со всеми сообществами."""
+        response, _ = self.get_changelist()
+        content = response.content.decode()
+        self.assertIn('admin-autocomplete', content)
+        self.assertNotIn(
+            f'<option value="{self.unused_group.pk}"', content)
+
+    def test_sorting_uses_page_numbers(self):
+        """При сортировке по колонке работают номера страниц."""
+        for params in ({'o': '3'}, {'o': '3', 'p': '1'}):
+            with self.subTest(params=params):
+                response, _ = self.get_changelist(params)
+                cl = response.context['cl']
+                self.assertIsNone(cl.cursor_page)
+                self.assertEqual(cl.paginator.num_pages, 2)
+
+    def test_date_hierarchy(self):
+        """Иерархия дат фильтрует список по году."""
+        year = Post.objects.first().pub_date.year
+        response, _ = self.get_changelist({'pub_date__year': year})
+        self.assertEqual(response.context['cl'].date_hierarchy, 'pub_date')
+        response, _ = self.get_changelist({'pub_date__year': year - 1})
+        self.assertEqual(len(response.context['cl'].result_list), 0)
+
+    def test_group_autocomplete(self):
+        """Автодополнение находит сообщество по названию."""
+        response = self.admin_client.get(
+            reverse('admin:posts_group_autocomplete'),
+            {'term': 'Сообщество 19'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item['text'] for item in response.json()['results']],
+            ['Сообщество 19'])
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        Post.objects.bulk_create(Post(
+            text=f'Тестовый пост {post_number}',
+            group=cls.group,
+            author=cls.user,
+        ) for post_number in range(settings.POST_PER_PAGE + 2))
+        cls.post = Post.objects.first()
+        cls.feed_urls = [
+            reverse('api:index'),
+            reverse('api:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('api:profile', kwargs={'username': cls.user.username}),
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_feed_returns_page_and_cursors(self):
+        """API ленты отдаёт страницу записей и курсор следующей."""
+        for url in self.feed_urls:
+            with self.subTest(url=url):
+                data = self.client.get(url).json()
+                self.assertEqual(
+                    len(data['results']), settings.POST_PER_PAGE)
+                self.assertEqual(data['results'][0], {
+                    'id': self.post.id,
+                    'text': self.post.text,
+                    'pub_date': self.post.pub_date.isoformat(),
+                    'updated_at': self.post.updated_at.isoformat(),
+                    'author': 'some_user',
+                    'group': 'test-slug',
+                })
+                self.assertIsNone(data['previous'])
+                data = self.client.get(url, {'after': data['next']}).json()
+                self.assertEqual(len(data['results']), 2)
+                self.assertIsNone(data['next'])
+
+    def test_feed_not_modified_before_loading_posts(self):
+        """С совпавшим ETag лента отвечает 304 без загрузки записей."""
+        for url in self.feed_urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(response['ETag'], etag)
+                for query in context.captured_queries:
+                    self.assertNotIn('"posts_post"."text"', query['sql'])
+
+    def test_etag_changes_after_edit(self):
+        """Изменение записи меняет ETag ленты и записи."""
+        urls = self.feed_urls + [
+            reverse('api:post_detail', kwargs={'post_id': self.post.id})]
+        etags = [self.client.get(url)['ETag'] for url in urls]
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Новый текст'
+        post.save()
+        for url, etag in zip(urls, etags):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertNotEqual(response['ETag'], etag)
+
+    def test_post_detail(self):
+        """API записи отдаёт запись или 404."""
+        url = reverse('api:post_detail', kwargs={'post_id': self.post.id})
+        response = self.client.get(url)
+        self.assertEqual(response.json()['id'], self.post.id)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        response = self.client.get(
+            reverse('api:post_detail', kwargs={'post_id': 0}))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
@@ -0,0 +1,174 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, ImportProgress, Post, PostCounter
+
+User = get_user_model()
+
+
+class ImportPostsCommandTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'posts.jsonl')
+        records = [
+            {'text': f'Импорт {number}', 'author': 'some_user',
+             'group': 'test-slug', 'pub_date': f'2020-01-0{number + 1}T10:00'}
+            for number in range(5)
+        ]
+        records.append({'text': 'Чужой пост', 'author': 'nobody'})
+        with open(self.path, 'w', encoding='utf-8') as source:
+            for record in records:
+                source.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def import_posts(self, *args):
+        call_command(
+            'import_posts', self.path, '--chunk-size', '2', *args,
+            stdout=StringIO())
+
+    def test_import_posts_from_jsonl(self):
+        """Команда импортирует записи, сохраняя даты и счётчики."""
+        self.import_posts()
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertEqual(
+            Post.objects.order_by('pub_date').first().pub_date,
+            datetime(2020, 1, 1, 10, 0))
+        self.assertEqual(self.group.posts.count(), 5)
+        self.assertEqual(
+            PostCounter.objects.get(author=self.user).posts_count, 5)
+
+    def test_import_resumes_from_saved_progress(self):
+        """Повторный запуск продолжает с места, сохранённого в базе."""
+        ImportProgress.objects.create(
+            source=os.path.abspath(self.path), records=4)
+        self.import_posts()
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['Импорт 4'])
+        self.import_posts()
+        self.assertEqual(Post.objects.count(), 1)
+        self.import_posts('--restart', '--create-missing')
+        self.assertEqual(Post.objects.count(), 7)
+        self.assertTrue(User.objects.filter(username='nobody').exists())
+
+    def test_import_skips_bad_lines_and_nameless_records(self):
+        """Испорченные строки и записи без автора пропускаются и считаются."""
+        with open(self.path, 'a', encoding='utf-8') as source:
+            source.write('{"text": "Оборванная строка\n')
+            source.write('[1, 2]\n')
+            for record in (
+                {'text': 'Пустой автор', 'author': ''},
+                {'text': 'Без автора'},
+                {'text': 'Пустое сообщество', 'author': 'some_user',
+                 'group': '  '},
+            ):
+                source.write(json.dumps(record, ensure_ascii=False) + '\n')
+            source.write(json.dumps({'text': 'После', 'author': 'late'}))
+        output = StringIO()
+        call_command(
+            'import_posts', self.path, '--chunk-size', '2',
+            '--create-missing', stdout=output)
+        self.assertEqual(Post.objects.count(), 7)
+        self.assertFalse(User.objects.filter(username__in=['', '  ']).exists())
+        self.assertFalse(Group.objects.exclude(pk=self.group.pk).exists())
+        self.assertIn(
+            'пропущено 5 (испорченных строк 2)', output.getvalue())
+
+    def test_failed_chunk_keeps_progress_consistent(self):
+        """Прогресс откатывается вместе с упавшей порцией записей."""
+        add = PostCounter.objects.add
+        calls = []
+
+        def fail_on_second_chunk(author_id, delta):
+            calls.append(delta)
+            if len(calls) == 2:
+                raise RuntimeError('Сбой импорта')
+            add(author_id, delta)
+
+        with mock.patch.object(
+                PostCounter.objects, 'add', fail_on_second_chunk):
+            with self.assertRaises(RuntimeError):
+                call_command(
+                    'import_posts', self.path, '--chunk-size', '2',
+                    stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(
+            ImportProgress.objects.get(
+                source=os.path.abspath(self.path)).records, 2)
+        self.import_posts()
+        self.assertEqual(Post.objects.count(), 5)
+
+
+class ExportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.user, text=f'Пост, номер {number}',
+                group=cls.group if number % 2 else None)
+            for number in range(4)
+        ]
+
+    def test_export_posts_command(self):
+        """Команда выгружает записи автора в JSONL от старых к новым."""
+        stdout = StringIO()
+        call_command('export_posts', '--author', 'some_user', stdout=stdout)
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(
+            [row['id'] for row in rows], [post.id for post in self.posts])
+        self.assertEqual(rows[1]['group'], 'test-slug')
+        self.assertEqual(rows[0]['author'], 'some_user')
+
+    def test_export_endpoints_stream_csv_and_jsonl(self):
+        """Выгрузка сообщества и профиля отдаётся потоком."""
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(
+            reverse('posts:group_export', kwargs={'slug': 'test-slug'}),
+            {'format': 'csv'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,text,pub_date,updated_at,author,group')
+        self.assertEqual(len(lines), 3)
+        self.assertIn('"Пост, номер 1"', lines[1])
+
+        response = client.get(
+            reverse('posts:profile_export', kwargs={
+                'username': 'some_user'}))
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+
+        response = client.get(
+            reverse('posts:profile_export', kwargs={
+                'username': 'some_user'}), {'format': 'xml'})
+        self.assertEqual(response.status_code, 404)
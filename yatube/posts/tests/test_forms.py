@@ -2,7 +2,8 @@ import tempfile
 import shutil
 
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from django.conf import settings
 
@@ -10,8 +11,17 @@ from posts.models import Post, Group
 
 User = get_user_model()
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
 
 
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class PostFormTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -86,3 +96,16 @@ class PostFormTests(TestCase):
         self.assertEqual(post.group_id, form_data['group'])
         self.assertRedirects(response, reverse(
             'posts:post_detail', kwargs={'post_id': self.post.id}))
+
+    def test_create_post_with_image(self):
+        """Картинка сохраняется, а миниатюры ждут фонового обработчика."""
+        form_data = {
+            'text': 'Пост с картинкой',
+            'image': SimpleUploadedFile(
+                'small.gif', SMALL_GIF, content_type='image/gif'),
+        }
+        self.authorized_user.post(
+            reverse('posts:post_create'), data=form_data, follow=True)
+        post = Post.objects.get(text=form_data['text'])
+        self.assertEqual(post.image.name, 'posts/small.gif')
+        self.assertFalse(post.thumbnail)
@@ -0,0 +1,128 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.lookups import (LookupCache, clear_lookup_caches,
+                           get_lookup_stats)
+from posts.models import Group, Post, PostCounter
+
+User = get_user_model()
+
+
+class LookupCacheTest(TestCase):
+    def setUp(self):
+        self.loaded = []
+
+    def loader(self, key):
+        self.loaded.append(key)
+        return None if key == 'missing' else Group(pk=len(self.loaded))
+
+    def test_hits_misses_and_eviction(self):
+        """Кэш считает попадания и вытесняет давно не читанные ключи."""
+        lookups = LookupCache(self.loader, maxsize=2, timeout=60)
+        lookups.get('first')
+        lookups.get('second')
+        lookups.get('first')
+        lookups.get('third')
+        lookups.get('second')
+        self.assertEqual(self.loaded, ['first', 'second', 'third', 'second'])
+        self.assertEqual(lookups.stats(), {
+            'hits': 1, 'misses': 4, 'size': 2, 'maxsize': 2})
+
+    def test_entries_expire(self):
+        """Записи старше timeout читаются из базы заново."""
+        lookups = LookupCache(self.loader, maxsize=2, timeout=0)
+        lookups.get('first')
+        lookups.get('first')
+        self.assertEqual(self.loaded, ['first', 'first'])
+
+    def test_copies_are_returned(self):
+        """Изменения выданного объекта не попадают в кэш."""
+        lookups = LookupCache(self.loader, maxsize=2, timeout=60)
+        lookups.get('first').title = 'Изменённый'
+        self.assertEqual(lookups.get('first').title, '')
+
+    def test_missing_rows_are_cached_until_invalidated(self):
+        """Промах кэшируется и сбрасывается при появлении строки."""
+        lookups = LookupCache(self.loader, maxsize=2, timeout=60)
+        self.assertIsNone(lookups.get('missing'))
+        self.assertIsNone(lookups.get('missing'))
+        lookups.invalidate(10, 'other')
+        lookups.get('missing')
+        self.assertEqual(self.loaded, ['missing', 'missing'])
+
+
+class LookupInvalidationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        clear_lookup_caches()
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
+
+    def test_repeated_lookups_skip_database(self):
+        """Повторные страницы не ищут сообщество и автора в базе."""
+        reverse_name_list = [
+            (reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+             '"posts_group"."slug" ='),
+            (reverse('posts:profile', kwargs={'username': 'some_user'}),
+             '"auth_user"."username" ='),
+        ]
+        for reverse_name, condition in reverse_name_list:
+            with self.subTest(reverse_name=reverse_name):
+                self.authorized_user.get(reverse_name)
+                with CaptureQueriesContext(connection) as context:
+                    self.authorized_user.get(reverse_name)
+                self.assertFalse([
+                    query for query in context.captured_queries
+                    if condition in query['sql']
+                ])
+        stats = get_lookup_stats()
+        self.assertGreater(stats['groups_by_slug']['hits'], 0)
+        self.assertGreater(stats['authors_by_username']['hits'], 0)
+
+    def test_group_save_invalidates_lookup(self):
+        """Смена адреса сообщества сразу видна на страницах."""
+        old_url = reverse('posts:group_list', kwargs={'slug': 'test-slug'})
+        self.assertEqual(self.authorized_user.get(old_url).status_code, 200)
+        self.group.slug = 'new-slug'
+        self.group.save()
+        self.assertEqual(self.authorized_user.get(old_url).status_code, 404)
+        response = self.authorized_user.get(
+            reverse('posts:group_list', kwargs={'slug': 'new-slug'}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_user_delete_invalidates_lookup(self):
+        """Удалённый пользователь сразу пропадает со страниц."""
+        author = User.objects.create_user(username='short_lived')
+        url = reverse('posts:profile', kwargs={'username': 'short_lived'})
+        self.assertEqual(self.authorized_user.get(url).status_code, 200)
+        author.delete()
+        self.assertEqual(self.authorized_user.get(url).status_code, 404)
+
+    def test_profile_counter_is_read_per_request(self):
+        """Счётчик в шапке профиля читается заново, даже если автор
+        взят из кэша поиска, и учитывает записи из других процессов.
+        """
+        url = reverse('posts:profile', kwargs={'username': 'some_user'})
+        response = self.authorized_user.get(url)
+        self.assertEqual(response.context['posts_count'], 1)
+        PostCounter.objects.filter(author=self.user).update(posts_count=7)
+        cache.clear()
+        response = self.authorized_user.get(url)
+        self.assertEqual(response.context['posts_count'], 7)
+        self.assertContains(response, 'Всего постов автора: 7')
@@ -1,7 +1,12 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 
-from ..models import Group, Post
+from ..feeds import ALL_FEEDS, get_feed_version
+from ..models import Group, Post, PostCounter
+from ..seeding import seed_posts
 
 
 User = get_user_model()
@@ -83,3 +88,104 @@ class PostModelTest(TestCase):
                 self.assertEqual(
                     self.group._meta.get_field(
                         field).help_text, expected_value)
+
+
+class PostExcerptTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+
+    def test_excerpt_is_rendered_on_save(self):
+        """Начало записи экранируется, переносится и обрезается."""
+        text = '<b>Первая</b> строка\n' + ' '.join(['слово'] * 60)
+        post = Post.objects.create(author=self.user, text=text)
+        self.assertTrue(post.excerpt.startswith(
+            '&lt;b&gt;Первая&lt;/b&gt; строка<br>слово'))
+        self.assertTrue(post.excerpt.endswith('слово …'))
+        self.assertEqual(len(post.excerpt.split()), 51)
+
+    def test_excerpt_follows_text_with_update_fields(self):
+        """Сохранение только текста обновляет и начало записи."""
+        post = Post.objects.create(author=self.user, text='Старый текст')
+        post.text = 'Новый текст'
+        post.save(update_fields=['text'])
+        self.assertEqual(
+            Post.objects.get(pk=post.pk).excerpt, 'Новый текст')
+
+
+class PostCounterTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.another_user = User.objects.create_user(username='another_user')
+
+    def posts_count(self, user):
+        return PostCounter.objects.get(author=user).posts_count
+
+    def test_counter_follows_create_delete_and_reassignment(self):
+        """Счётчик меняется при создании, удалении и смене автора."""
+        post = Post.objects.create(author=self.user, text='Первый пост')
+        Post.objects.create(author=self.user, text='Второй пост')
+        self.assertEqual(self.posts_count(self.user), 2)
+
+        post = Post.objects.get(pk=post.pk)
+        post.author = self.another_user
+        post.save()
+        self.assertEqual(self.posts_count(self.user), 1)
+        self.assertEqual(self.posts_count(self.another_user), 1)
+
+        post.delete()
+        self.assertEqual(self.posts_count(self.another_user), 0)
+
+    def test_recount_posts_command(self):
+        """Команда recount_posts восстанавливает счётчики после bulk_create."""
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Пост {number}')
+            for number in range(3)
+        )
+        self.assertFalse(PostCounter.objects.filter(author=self.user).exists())
+        version = get_feed_version(ALL_FEEDS)
+        call_command('recount_posts', stdout=StringIO())
+        self.assertEqual(self.posts_count(self.user), 3)
+        self.assertNotEqual(get_feed_version(ALL_FEEDS), version)
+
+
+class SeedPostsTest(TestCase):
+    def test_seed_posts_creates_consistent_data(self):
+        """Генератор создаёт записи, авторов, сообщества и счётчики."""
+        author_ids, group_ids = seed_posts(
+            120, users=5, groups=3, batch_size=50)
+        self.assertEqual(Post.objects.count(), 120)
+        self.assertEqual(len(author_ids), 5)
+        self.assertEqual(len(group_ids), 3)
+        self.assertEqual(
+            sum(PostCounter.objects.values_list('posts_count', flat=True)),
+            120)
+        self.assertEqual(
+            Post.objects.filter(pub_date__isnull=False).count(), 120)
+        self.assertFalse(Post.objects.filter(excerpt='').exists())
+
+    def test_repeated_seeding_uses_only_new_authors(self):
+        """Повторный запуск не раздаёт записи авторам прошлых запусков."""
+        old_authors, old_groups = seed_posts(10, users=2, groups=2)
+        author_ids, group_ids = seed_posts(30, users=3, groups=2)
+        self.assertEqual(len(author_ids), 3)
+        self.assertFalse(set(author_ids) & set(old_authors))
+        self.assertFalse(set(group_ids) & set(old_groups))
+        self.assertEqual(
+            Post.objects.filter(author_id__in=old_authors).count(), 10)
+
+    def test_seeding_after_deleting_seed_rows(self):
+        """После удаления части синтетических данных имена не повторяются."""
+        author_ids, group_ids = seed_posts(5, users=3, groups=3)
+        User.objects.filter(pk=author_ids[0]).delete()
+        Group.objects.filter(pk=group_ids[0]).delete()
+        new_authors, new_groups = seed_posts(5, users=2, groups=2)
+        self.assertEqual(len(new_authors), 2)
+        self.assertEqual(len(new_groups), 2)
+        self.assertTrue(
+            User.objects.filter(username='seed_user_4').exists())
+        self.assertTrue(
+            Group.objects.filter(slug='seed-group-4').exists())
@@ -0,0 +1,77 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+FULL_SCAN = re.compile(r'\bSCAN (TABLE )?\w+$')
+TEMP_SORT = re.compile(r'USE TEMP B-TREE')
+
+
+def explain(sql):
+    """Строки EXPLAIN QUERY PLAN для запроса."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class FeedQueryPlanTests(TestCase):
+    """Запросы лент не должны сканировать таблицу или сортировать её."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        Post.objects.bulk_create(Post(
+            text=f'Тестовый пост {post_number}',
+            group=cls.group,
+            author=cls.user,
+        ) for post_number in range(settings.POST_PER_PAGE * 2))
+
+    def setUp(self):
+        self.unauthorized_user = Client()
+
+    def feed_queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.unauthorized_user.get(url, data)
+        return response, [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+
+    def assert_plans_use_indexes(self, url, data=None):
+        response, queries = self.feed_queries(url, data)
+        self.assertTrue(queries)
+        for sql in queries:
+            for line in explain(sql):
+                with self.subTest(url=url, sql=sql, plan=line):
+                    self.assertIsNone(FULL_SCAN.search(line))
+                    self.assertIsNone(TEMP_SORT.search(line))
+        return response
+
+    def test_feed_queries_use_indexes(self):
+        """index, group_posts и profile читают ленты по индексам."""
+        reverse_name_list = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={
+                'username': self.user.username}),
+        ]
+        for reverse_name in reverse_name_list:
+            response = self.assert_plans_use_indexes(reverse_name)
+            page_obj = response.context['page_obj']
+            self.assert_plans_use_indexes(
+                reverse_name, {'after': page_obj.next_cursor})
+            self.assert_plans_use_indexes(reverse_name, {'page': 2})
@@ -0,0 +1,112 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Post
+from posts.tests.test_forms import SMALL_GIF
+from posts.thumbnails import pending_posts, process_pending
+
+User = get_user_model()
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ThumbnailPipelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
+        self.post = Post.objects.create(
+            author=self.user,
+            text='Пост с картинкой',
+            image=SimpleUploadedFile(
+                'small.gif', SMALL_GIF, content_type='image/gif'),
+        )
+        self.urls = [
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': 'some_user'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}),
+        ]
+
+    def test_pages_show_placeholder_until_worker_runs(self):
+        """До обработки страницы показывают заглушку, после - миниатюру."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.authorized_user.get(url)
+                self.assertContains(response, 'img/placeholder.svg')
+                self.assertNotContains(response, 'cache/')
+        self.assertEqual(process_pending(10), 1)
+        self.assertFalse(pending_posts().exists())
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.authorized_user.get(url)
+                self.assertNotContains(response, 'img/placeholder.svg')
+                self.assertContains(response, settings.MEDIA_URL + 'cache/')
+
+    def test_new_image_needs_new_thumbnails(self):
+        """Смена картинки снова ставит запись в очередь обработчика."""
+        call_command('thumbnail_worker', once=True, stdout=StringIO())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertTrue(post.thumbnail.name.startswith('cache/'))
+        post.image = SimpleUploadedFile(
+            'other.gif', SMALL_GIF, content_type='image/gif')
+        post.save(update_fields=['image'])
+        self.assertFalse(Post.objects.get(pk=post.pk).thumbnail)
+        post.text = 'Новый текст'
+        post.save()
+        self.assertEqual(list(pending_posts()), [post])
+
+    def test_deferred_image_keeps_thumbnail(self):
+        """Сохранение записи, загруженной без картинки, не сбрасывает
+        готовую миниатюру.
+        """
+        process_pending(10)
+        post = Post.objects.only('id', 'text').get(pk=self.post.pk)
+        post.text = 'Новый текст'
+        post.save()
+        self.assertTrue(Post.objects.get(pk=post.pk).thumbnail)
+        post = Post.objects.defer('image').get(pk=self.post.pk)
+        post.image = SimpleUploadedFile(
+            'other.gif', SMALL_GIF, content_type='image/gif')
+        post.save()
+        self.assertFalse(Post.objects.get(pk=post.pk).thumbnail)
+
+    @override_settings(THUMBNAIL_MAX_ATTEMPTS=2)
+    def test_broken_image_is_retried_with_backoff(self):
+        """Битая картинка откладывается, а после лимита попыток
+        больше не берётся.
+        """
+        self.post.image = SimpleUploadedFile(
+            'broken.gif', b'not an image', content_type='image/gif')
+        self.post.save()
+        with self.assertLogs(level='ERROR'):
+            self.assertEqual(process_pending(10), 0)
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.thumbnail_attempts, 1)
+        self.assertGreater(post.thumbnail_retry_at, timezone.now())
+        self.assertFalse(pending_posts().exists())
+        Post.objects.filter(pk=post.pk).update(thumbnail_retry_at=None)
+        with self.assertLogs(level='ERROR') as logs:
+            process_pending(10)
+        self.assertIn('за 2 попыток', logs.output[-1])
+        Post.objects.filter(pk=post.pk).update(thumbnail_retry_at=None)
+        self.assertFalse(pending_posts().exists())
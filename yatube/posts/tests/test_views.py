@@ -3,11 +3,15 @@ from random import randint
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from posts.models import Post, Group
 from posts.forms import PostForm
+from posts.paginators import WindowPaginator
 
 User = get_user_model()
 
@@ -31,6 +35,7 @@ class PostViewTests(TestCase):
         )
 
     def setUp(self):
+        cache.clear()
         self.unauthorized_user = Client()
         self.authorized_user = Client()
         self.authorized_user.force_login(self.user)
@@ -114,6 +119,7 @@ class PaginatorViewTest(TestCase):
         ]
 
     def setUp(self):
+        cache.clear()
         self.unauthorized_user = Client()
 
     def test_paginator_on_first_page(self):
@@ -144,3 +150,473 @@ class PaginatorViewTest(TestCase):
                         reverse_name + f'?page={str(last_page_number)}')
                     self.assertEqual(len(response.context['page_obj']),
                                      posts_on_last_page)
+
+
+class CursorPaginatorViewTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        Post.objects.bulk_create(Post(
+            text=f'Тестовый пост {post_number}',
+            group=cls.group,
+            author=cls.user,
+        ) for post_number in range(settings.POST_PER_PAGE * 2 + 3))
+        cls.expected_ids = list(Post.objects.values_list('id', flat=True))
+        cls.reverse_name_list = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.unauthorized_user = Client()
+
+    def test_cursor_pages_cover_feed_in_order(self):
+        """Курсоры after/before обходят ленту целиком и без повторов."""
+        for reverse_name in self.reverse_name_list:
+            with self.subTest(reverse_name=reverse_name):
+                pages = []
+                page_obj = self.unauthorized_user.get(
+                    reverse_name).context['page_obj']
+                self.assertFalse(page_obj.has_previous())
+                pages.append([post.id for post in page_obj])
+                while page_obj.has_next():
+                    page_obj = self.unauthorized_user.get(
+                        reverse_name,
+                        {'after': page_obj.next_cursor}).context['page_obj']
+                    pages.append([post.id for post in page_obj])
+                self.assertEqual(sum(pages, []), self.expected_ids)
+                self.assertEqual(len(pages[-1]), 3)
+
+                page_obj = self.unauthorized_user.get(
+                    reverse_name,
+                    {'before': page_obj.previous_cursor}).context['page_obj']
+                self.assertEqual([post.id for post in page_obj], pages[-2])
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Испорченный курсор открывает первую страницу ленты."""
+        response = self.unauthorized_user.get(
+            reverse('posts:index'), {'after': 'not-a-cursor'})
+        self.assertEqual(
+            [post.id for post in response.context['page_obj']],
+            self.expected_ids[:settings.POST_PER_PAGE])
+
+    def test_page_number_links_still_work(self):
+        """Старые ссылки вида ?page=N открывают нужную страницу."""
+        response = self.unauthorized_user.get(
+            reverse('posts:index'), {'page': 2})
+        self.assertEqual(response.context['page_obj'].number, 2)
+        self.assertEqual(
+            [post.id for post in response.context['page_obj']],
+            self.expected_ids[settings.POST_PER_PAGE:
+                              settings.POST_PER_PAGE * 2])
+
+
+class FeedExcerptTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый\nпост', group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
+
+    def test_feeds_render_excerpt_without_loading_text(self):
+        """Ленты показывают готовое начало записи и не читают text."""
+        reverse_name_list = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+            reverse('posts:search') + '?q=Тестовый',
+        ]
+        for reverse_name in reverse_name_list:
+            with self.subTest(reverse_name=reverse_name):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.authorized_user.get(reverse_name)
+                self.assertContains(response, 'Тестовый<br>пост')
+                self.assertFalse([
+                    query for query in context.captured_queries
+                    if '"posts_post"."text"' in query['sql']
+                ])
+
+
+class WindowPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        Post.objects.bulk_create(Post(
+            text=f'Тестовый пост {post_number}',
+            author=cls.user,
+        ) for post_number in range(settings.POST_PER_PAGE * 30))
+
+    def setUp(self):
+        cache.clear()
+        self.unauthorized_user = Client()
+
+    def test_elided_page_range(self):
+        """Окно страниц содержит крайние страницы, соседей и пропуски."""
+        paginator = WindowPaginator(range(1000), 10)
+        ellipsis = WindowPaginator.ELLIPSIS
+        self.assertEqual(
+            list(paginator.get_elided_page_range(50)),
+            [1, ellipsis, 47, 48, 49, 50, 51, 52, 53, ellipsis, 100])
+        self.assertEqual(
+            list(paginator.get_elided_page_range(1)),
+            [1, 2, 3, 4, ellipsis, 100])
+        self.assertEqual(
+            list(paginator.get_elided_page_range(100)),
+            [1, ellipsis, 97, 98, 99, 100])
+        self.assertEqual(
+            list(WindowPaginator(range(50), 10).get_elided_page_range(3)),
+            [1, 2, 3, 4, 5])
+
+    def test_page_links_do_not_grow_with_feed(self):
+        """Число ссылок на страницы не зависит от длины ленты."""
+        response = self.unauthorized_user.get(
+            reverse('posts:index'), {'page': 15})
+        content = response.content.decode()
+        self.assertEqual(content.count('class="page-item'), 15)
+        self.assertIn('page=30', content)
+        self.assertNotIn('page=20"', content)
+
+
+class FeedCountCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        Post.objects.bulk_create(Post(
+            text=f'Тестовый пост {post_number}',
+            group=cls.group,
+            author=cls.user,
+        ) for post_number in range(settings.POST_PER_PAGE + 1))
+        cls.reverse_name_list = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
+
+    def get_count(self, reverse_name):
+        with CaptureQueriesContext(connection) as context:
+            response = self.authorized_user.get(reverse_name, {'page': 1})
+        count_queries = [
+            query for query in context.captured_queries
+            if 'COUNT(' in query['sql'] and 'posts_post' in query['sql']
+        ]
+        return response.context['page_obj'].paginator.count, count_queries
+
+    def test_feed_count_is_cached(self):
+        """Итог ленты считается в базе один раз."""
+        for reverse_name in self.reverse_name_list:
+            with self.subTest(reverse_name=reverse_name):
+                count, queries = self.get_count(reverse_name)
+                self.assertEqual(count, settings.POST_PER_PAGE + 1)
+                self.assertEqual(len(queries), 1)
+                count, queries = self.get_count(reverse_name)
+                self.assertEqual(count, settings.POST_PER_PAGE + 1)
+                self.assertEqual(queries, [])
+
+    def test_feed_count_follows_post_changes(self):
+        """Создание, перенос и удаление записи меняют закэшированный итог."""
+        another_group = Group.objects.create(
+            title='Другая группа', description='Описание', slug='another')
+        for reverse_name in self.reverse_name_list:
+            self.get_count(reverse_name)
+        post = Post.objects.create(
+            author=self.user, text='Новый пост', group=self.group)
+        for reverse_name in self.reverse_name_list:
+            with self.subTest(reverse_name=reverse_name):
+                count, queries = self.get_count(reverse_name)
+                self.assertEqual(count, settings.POST_PER_PAGE + 2)
+                self.assertEqual(queries, [])
+
+        post.group = another_group
+        post.save()
+        group_url = self.reverse_name_list[1]
+        self.assertEqual(
+            self.get_count(group_url)[0], settings.POST_PER_PAGE + 1)
+
+        Post.objects.get(pk=post.pk).delete()
+        self.assertEqual(
+            self.get_count(self.reverse_name_list[0])[0],
+            settings.POST_PER_PAGE + 1)
+
+    @override_settings(POST_COUNT_ESTIMATE=True, POST_COUNT_ESTIMATE_LIMIT=5)
+    def test_estimated_count_is_bounded(self):
+        """В режиме оценки итог не превышает POST_COUNT_ESTIMATE_LIMIT."""
+        self.assertEqual(self.get_count(self.reverse_name_list[0])[0], 5)
+
+    @override_settings(POST_COUNT_ESTIMATE=True, POST_COUNT_ESTIMATE_LIMIT=5)
+    def test_pages_past_estimate_are_not_clamped(self):
+        """Номер страницы за оценкой итога отдаёт свои записи по курсору,
+        а пустая страница - 404.
+        """
+        url = self.reverse_name_list[0]
+        expected = list(Post.objects.values_list('pk', flat=True)[
+            settings.POST_PER_PAGE:settings.POST_PER_PAGE * 2])
+        response = self.authorized_user.get(url, {'page': 2})
+        self.assertEqual(
+            [post.pk for post in response.context['page_obj']], expected)
+        self.assertTrue(response.context['page_obj'].has_previous())
+        response = self.authorized_user.get(url, {'page': 100})
+        self.assertEqual(response.status_code, 404)
+
+
+class PostFragmentCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.post = Post.objects.create(author=cls.user, text='Старый текст')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
+
+    def test_edit_invalidates_cached_fragment(self):
+        """После post_edit лента показывает новый текст записи."""
+        response = self.authorized_user.get(reverse('posts:index'))
+        self.assertContains(response, 'Старый текст')
+        self.authorized_user.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
+            {'text': 'Новый текст'},
+        )
+        response = self.authorized_user.get(reverse('posts:index'))
+        self.assertContains(response, 'Новый текст')
+        self.assertNotContains(response, 'Старый текст')
+
+
+class AnonymousFeedCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.another_user = User.objects.create_user(username='another_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        cls.another_group = Group.objects.create(
+            title='Другая группа',
+            description='Описание другой группы',
+            slug='another-slug',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group)
+        Post.objects.create(
+            author=cls.another_user, text='Другой пост',
+            group=cls.another_group)
+
+    def setUp(self):
+        cache.clear()
+        self.unauthorized_user = Client()
+
+    def queries_for(self, reverse_name):
+        with CaptureQueriesContext(connection) as context:
+            self.unauthorized_user.get(reverse_name)
+        return len(context.captured_queries)
+
+    def test_anonymous_feed_is_served_from_cache(self):
+        """Повторный анонимный запрос ленты не строит страницу заново."""
+        reverse_name = reverse('posts:index')
+        self.assertGreater(self.queries_for(reverse_name), 0)
+        self.assertEqual(self.queries_for(reverse_name), 0)
+
+    def test_post_save_invalidates_only_its_feeds(self):
+        """Новая запись сбрасывает только свои ленты."""
+        own_feeds = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        ]
+        other_feeds = [
+            reverse('posts:group_list', kwargs={
+                'slug': self.another_group.slug}),
+            reverse('posts:profile', kwargs={
+                'username': self.another_user.username}),
+        ]
+        for reverse_name in own_feeds + other_feeds:
+            self.unauthorized_user.get(reverse_name)
+        Post.objects.create(
+            author=self.user, text='Свежий пост', group=self.group)
+        for reverse_name in own_feeds:
+            with self.subTest(reverse_name=reverse_name):
+                self.assertContains(
+                    self.unauthorized_user.get(reverse_name), 'Свежий пост')
+        for reverse_name in other_feeds:
+            with self.subTest(reverse_name=reverse_name):
+                self.assertLessEqual(self.queries_for(reverse_name), 1)
+
+    def test_authorized_feed_is_not_cached(self):
+        """Авторизованным пользователям страница строится каждый раз."""
+        authorized_user = Client()
+        authorized_user.force_login(self.user)
+        authorized_user.get(reverse('posts:index'))
+        response = authorized_user.get(reverse('posts:index'))
+        self.assertIsNotNone(response.context)
+
+
+class PostSearchViewTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.exact_post = Post.objects.create(
+            author=cls.user, text='Кошка ловит мышь')
+        cls.other_post = Post.objects.create(
+            author=cls.user, text='Собака охраняет дом')
+        cls.ranked_post = Post.objects.create(
+            author=cls.user, text='Кошка кошка кошка и ещё немного текста')
+
+    def setUp(self):
+        cache.clear()
+        self.unauthorized_user = Client()
+
+    def search(self, query):
+        response = self.unauthorized_user.get(
+            reverse('posts:search'), {'q': query})
+        return list(response.context['page_obj'])
+
+    def test_search_finds_matching_posts_by_rank(self):
+        """Поиск находит записи со всеми словами, лучшие - первыми."""
+        self.assertEqual(self.search('кошка'),
+                         [self.ranked_post, self.exact_post])
+        self.assertEqual(self.search('кошка мышь'), [self.exact_post])
+        self.assertEqual(self.search(''), [])
+
+    def test_search_index_follows_edits_and_deletes(self):
+        """Индекс поиска обновляется при изменении и удалении записи."""
+        self.other_post.text = 'Собака ловит кошку'
+        self.other_post.save()
+        self.assertEqual(self.search('собака ловит'), [self.other_post])
+        self.other_post.delete()
+        self.assertEqual(self.search('собака'), [])
+
+    def test_search_accepts_fts_syntax_as_text(self):
+        """Спецсимволы FTS5 в запросе не ломают поиск."""
+        self.assertEqual(self.search('"кошка AND OR ('), [])
+
+    def test_admin_changelist_uses_search_index(self):
+        """Поиск в админке находит записи через тот же индекс."""
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='password')
+        self.unauthorized_user.force_login(admin)
+        response = self.unauthorized_user.get(
+            reverse('admin:posts_post_changelist'), {'q': 'мышь'})
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.exact_post])
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='some_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group)
+        cls.urls = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+            reverse('posts:post_detail', kwargs={'post_id': cls.post.id}),
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.unauthorized_user = Client()
+        self.authorized_user = Client()
+        self.authorized_user.force_login(self.user)
+
+    def test_unchanged_pages_return_not_modified(self):
+        """Страница без изменений отдаёт 304 по If-None-Match."""
+        for client in (self.unauthorized_user, self.authorized_user):
+            for url in self.urls:
+                with self.subTest(url=url):
+                    etag = client.get(url)['ETag']
+                    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                    self.assertEqual(response.status_code, 304)
+
+    def test_post_page_loads_post_once(self):
+        """ETag и страница записи используют одну загрузку записи."""
+        with self.assertNumQueries(1):
+            response = self.unauthorized_user.get(self.urls[-1])
+        self.assertEqual(response.context['post'], self.post)
+        self.assertIn('ETag', response)
+
+    def test_new_post_makes_pages_stale(self):
+        """Новая запись автора меняет ETag всех его страниц."""
+        etags = [self.authorized_user.get(url)['ETag'] for url in self.urls]
+        Post.objects.create(
+            author=self.user, text='Новый пост', group=self.group)
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.authorized_user.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_renames_make_pages_stale(self):
+        """Переименование автора или сообщества меняет ETag и кэш страниц."""
+        etags = [self.authorized_user.get(url)['ETag'] for url in self.urls]
+        self.unauthorized_user.get(self.urls[0])
+        self.user.last_name = 'Новофамильный'
+        self.user.save()
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.authorized_user.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Новофамильный')
+        self.group.title = 'Новое название'
+        self.group.save()
+        response = self.unauthorized_user.get(self.urls[0])
+        self.assertContains(response, 'Новое название')
+
+    def test_login_keeps_pages_fresh(self):
+        """Вход пользователя не сбрасывает ETag страниц."""
+        etag = self.authorized_user.get(self.urls[0])['ETag']
+        Client().force_login(self.user)
+        response = self.authorized_user.get(
+            self.urls[0], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_differs_between_readers(self):
+        """Анонимный и авторизованный читатели получают разные ETag."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertNotEqual(
+                    self.unauthorized_user.get(url)['ETag'],
+                    self.authorized_user.get(url)['ETag'])
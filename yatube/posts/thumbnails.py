@@ -0,0 +1,89 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from sorl.thumbnail import get_thumbnail
+
+from .feeds import bump_feed_versions, post_feeds
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+FEED_THUMBNAIL = ('960x339', {'crop': 'center', 'upscale': True})
+
+
+def pending_posts():
+    """Записи с картинкой, но без миниатюры, которым пора её построить.
+
+    Картинки, которые не открылись THUMBNAIL_MAX_ATTEMPTS раз, больше
+    не берутся, пока автор не загрузит другую.
+    """
+    return Post.objects.filter(thumbnail='').exclude(image='').filter(
+        Q(thumbnail_retry_at__isnull=True)
+        | Q(thumbnail_retry_at__lte=timezone.now()),
+        thumbnail_attempts__lt=settings.THUMBNAIL_MAX_ATTEMPTS,
+    )
+
+
+def retry_delay(attempts):
+    return settings.THUMBNAIL_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def record_failure(post):
+    """Откладывает следующую попытку с экспоненциальной паузой."""
+    attempts = post.thumbnail_attempts + 1
+    Post.objects.filter(pk=post.pk, image=post.image.name).update(
+        thumbnail_attempts=F('thumbnail_attempts') + 1,
+        thumbnail_retry_at=(
+            timezone.now() + timedelta(seconds=retry_delay(attempts))),
+    )
+    if attempts >= settings.THUMBNAIL_MAX_ATTEMPTS:
+        logger.error(
+            'Миниатюра записи %s не построена за %s попыток',
+            post.pk, attempts)
+
+
+def generate_thumbnail(post):
+    """Строит миниатюру записи и сохраняет её имя в Post.thumbnail.
+
+    Имя записывается, только если картинка не сменилась за время
+    работы, а версии лент записи сбрасываются, чтобы кэш страниц
+    заменил заглушку миниатюрой.
+    """
+    geometry, options = FEED_THUMBNAIL
+    thumbnail = get_thumbnail(post.image, geometry, **options)
+    if not thumbnail.exists():
+        raise OSError(f'Миниатюра для {post.image.name} не построена')
+    updated = Post.objects.filter(
+        pk=post.pk, image=post.image.name, thumbnail='',
+    ).update(thumbnail=thumbnail.name, updated_at=timezone.now())
+    if updated:
+        bump_feed_versions(post_feeds(post.author_id, post.group_id))
+    return bool(updated)
+
+
+def process_pending(batch_size):
+    """Один проход по записям без миниатюр; возвращает число готовых.
+
+    Записи читаются пачками по id, поэтому картинка, которую не удалось
+    открыть, не мешает обработать остальные; следующая попытка для неё
+    откладывается.
+    """
+    done = 0
+    last_id = 0
+    while True:
+        posts = list(pending_posts().filter(pk__gt=last_id).only(
+            'id', 'image', 'author_id', 'group_id', 'thumbnail_attempts',
+        ).order_by('id')[:batch_size])
+        for post in posts:
+            try:
+                done += generate_thumbnail(post)
+            except (OSError, ValueError):
+                logger.exception(
+                    'Не удалось построить миниатюру записи %s', post.pk)
+                record_failure(post)
+        if len(posts) < batch_size:
+            return done
+        last_id = posts[-1].pk
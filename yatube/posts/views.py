@@ -1,34 +1,103 @@
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.contrib.auth.models import User
+from django.views.decorators.http import condition
 
-from .models import Post, Group, User
+from core.http import make_etag
+from core.query_budget import query_budget
+from core.replicas import replica_reads
+
+from .models import Post, PostCounter
 from .forms import PostForm
+from .decorators import cache_anonymous_feed, feed_etag
+from .exporting import EXPORT_FORMATS, render_export
+from .lookups import (authors_by_username, get_author_or_404,
+                      get_group_or_404, groups_by_slug)
+from .feeds import (ALL_FEEDS, INDEX_FEED, author_feed, get_feed_version,
+                    group_feed)
+from .paginators import FeedPaginator
+from .search import search_posts
 
 
-def paginator(queryset):
-    paginator = Paginator(queryset, settings.POST_PER_PAGE)
+def paginator(queryset, feed=None):
+    paginator = FeedPaginator(queryset, settings.POST_PER_PAGE, feed=feed)
     return paginator
 
 
+def get_page_obj(request, queryset, feed=None):
+    """Страница ленты: по номеру для старых ссылок, иначе по курсору."""
+    if 'page' in request.GET:
+        return paginator(queryset, feed).get_page(request.GET.get('page'))
+    return paginator(queryset, feed).get_cursor_page(
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+
+
+def index_feed():
+    return INDEX_FEED
+
+
+def group_feed_by_slug(slug):
+    group = groups_by_slug.get(slug)
+    return group_feed(group.id) if group is not None else None
+
+
+def author_feed_by_username(username):
+    author = authors_by_username.get(username)
+    return author_feed(author.id) if author is not None else None
+
+
+def get_post(request, post_id):
+    """Запись страницы post_detail, загруженная один раз на запрос:
+    её берут и ETag, и само представление.
+    """
+    if not hasattr(request, '_post'):
+        request._post = Post.objects.select_related(
+            'author__post_counter', 'group').filter(pk=post_id).first()
+    return request._post
+
+
+def post_detail_etag(request, post_id):
+    """ETag страницы записи по её версии, счётчику записей автора и
+    общей версии лент.
+    """
+    post = get_post(request, post_id)
+    if post is None:
+        return None
+    counter = getattr(post.author, 'post_counter', None)
+    return make_etag(
+        post_id, post.updated_at,
+        counter.posts_count if counter is not None else None,
+        get_feed_version(ALL_FEEDS), request.user.pk)
+
+
+@query_budget(4)
+@replica_reads
+@condition(etag_func=feed_etag(index_feed))
+@cache_anonymous_feed(index_feed)
 def index(request):
     """Главная страница"""
-    page_obj = paginator(
-        Post.objects.select_related('author', 'group')).get_page(
-        request.GET.get('page'))
+    page_obj = get_page_obj(
+        request, Post.objects.select_related('author', 'group').defer('text'),
+        INDEX_FEED)
     context = {
         'page_obj': page_obj,
     }
     return render(request, 'posts/index.html', context)
 
 
+@query_budget(5)
+@replica_reads
+@condition(etag_func=feed_etag(group_feed_by_slug))
+@cache_anonymous_feed(group_feed_by_slug)
 def group_posts(request, slug):
     """Страница сообщества"""
-    group = get_object_or_404(Group, slug=slug)
-    page_obj = paginator(
-        group.posts.select_related('author')).get_page(request.GET.get('page'))
+    group = get_group_or_404(slug)
+    page_obj = get_page_obj(
+        request, group.posts.select_related('author').defer('text'),
+        group_feed(group.id))
     context = {
         'page_obj': page_obj,
         'group': group,
@@ -36,31 +105,88 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@query_budget(5)
+@replica_reads
+@condition(etag_func=feed_etag(author_feed_by_username))
+@cache_anonymous_feed(author_feed_by_username)
 def profile(request, username):
     """Страница пользователя"""
-    author = get_object_or_404(User, username=username)
-    page_obj = paginator(
-        author.posts.select_related('group')).get_page(request.GET.get('page'))
+    author = get_author_or_404(username)
+    page_obj = get_page_obj(
+        request, author.posts.select_related('group').defer('text'),
+        author_feed(author.id))
     context = {
         'author': author,
+        'posts_count': PostCounter.objects.posts_count(author.id),
         'page_obj': page_obj,
     }
     return render(request, 'posts/profile.html', context)
 
 
+def export_response(request, queryset, filename):
+    export_format = request.GET.get('format', 'jsonl')
+    if export_format not in EXPORT_FORMATS:
+        raise Http404('Неизвестный формат выгрузки')
+    response = StreamingHttpResponse(
+        render_export(queryset, export_format),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{filename}.{export_format}"')
+    return response
+
+
+@query_budget(3)
+@login_required
+def group_export(request, slug):
+    """Выгрузка всех записей сообщества"""
+    group = get_group_or_404(slug)
+    return export_response(request, group.posts.all(), f'group-{group.slug}')
+
+
+@query_budget(3)
+@login_required
+def profile_export(request, username):
+    """Выгрузка всех записей пользователя"""
+    author = get_author_or_404(username)
+    return export_response(
+        request, author.posts.all(), f'profile-{author.username}')
+
+
+@query_budget(3)
+@replica_reads
+@condition(etag_func=post_detail_etag)
 def post_detail(request, post_id):
     """Страница записи"""
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_post(request, post_id)
+    if post is None:
+        raise Http404('Запись не найдена')
     context = {
         'post': post
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+@query_budget(4)
+def search(request):
+    """Поиск по тексту записей"""
+    query = request.GET.get('q', '').strip()
+    page_obj = paginator(search_posts(
+        Post.objects.select_related('author', 'group').defer('text'),
+        query)).get_page(
+        request.GET.get('page'))
+    context = {
+        'page_obj': page_obj,
+        'query': query,
+    }
+    return render(request, 'posts/search.html', context)
+
+
+@query_budget(8)
 @login_required
 def post_create(request):
     """Страница для публикации записи"""
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
@@ -69,12 +195,14 @@ def post_create(request):
     return render(request, 'posts/create_post.html', {'form': form})
 
 
+@query_budget(6)
 @login_required
 def post_edit(request, post_id):
     """Страница для редактирования записи"""
     post = get_object_or_404(Post, pk=post_id)
-    if post.author == request.user:
-        form = PostForm(request.POST or None, instance=post)
+    if post.author_id == request.user.id:
+        form = PostForm(
+            request.POST or None, files=request.FILES or None, instance=post)
         if form.is_valid():
             post.save()
             return redirect('posts:post_detail', post.id)
@@ -7,6 +7,8 @@ from django.contrib.auth.views import (LoginView, LogoutView,
                                        PasswordResetCompleteView)
 from django.urls import path
 
+from core.ratelimit import rate_limit
+
 from . import views
 
 
@@ -15,12 +17,13 @@ app_name = 'users'
 urlpatterns = [
     path(
         'signup/',
-        views.SignUp.as_view(),
+        rate_limit('signup')(views.SignUp.as_view()),
         name='signup'
     ),
     path(
         'login/',
-        LoginView.as_view(template_name='users/login.html'),
+        rate_limit('login')(
+            LoginView.as_view(template_name='users/login.html')),
         name='login'
     ),
     path(
@@ -44,9 +47,9 @@ urlpatterns = [
     ),
     path(
         'password_reset/',
-        PasswordResetView.as_view(
+        rate_limit('password_reset')(PasswordResetView.as_view(
             template_name='users/password_reset_form.html'
-        ),
+        )),
         name='password_reset_form'
     ),
     path(
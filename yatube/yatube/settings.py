@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 SECRET_KEY = 'n(0(305r7v=q^6kai1t+oc278es6xv36n%5z$ua++u7&6)%ulu'
@@ -27,6 +29,24 @@ ALLOWED_HOSTS = [
 
 POST_PER_PAGE: int = 10
 
+POST_COUNT_CACHE_TIMEOUT: int = 60 * 60
+
+POST_PAGE_CACHE_TIMEOUT: int = 60 * 15
+
+POST_COUNT_ESTIMATE: bool = False
+
+POST_COUNT_ESTIMATE_LIMIT: int = 10_000
+
+QUERY_BUDGET_STRICT: bool = False
+
+SERVER_TIMING: bool = DEBUG
+
+SERVER_TIMING_LOG: bool = False
+
+LOOKUP_CACHE_SIZE: int = 1024
+
+LOOKUP_CACHE_TIMEOUT: int = 60 * 5
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -38,9 +58,12 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
+    'sorl.thumbnail',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ServerTimingMiddleware',
+    'core.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -48,6 +71,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
@@ -56,7 +80,7 @@ TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.server_timing.TimedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -75,11 +99,82 @@ WSGI_APPLICATION = 'yatube.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
     }
 }
 
+# Локальная реплика - второй файл SQLite, который обновляет
+# python manage.py sync_replica; после копирования команда сбрасывает
+# страницы и ETag, собранные из отстававшей реплики. Итоги лент всегда
+# считаются по основной базе. В тестах реплика смотрит в основную базу.
+if os.environ.get('YATUBE_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'core.backends.sqlite3',
+        'NAME': os.environ['YATUBE_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# В кэше default лежат версии, итоги и страницы лент posts.feeds и ведра
+# ограничения частоты запросов core.ratelimit. Он должен быть общим для
+# всех процессов, иначе запись сбросит страницы только в своём процессе,
+# а лимит будет считаться в каждом отдельно. Поэтому при YATUBE_WORKERS
+# больше 1 нужен memcached (YATUBE_MEMCACHED, пакет python-memcached):
+# без него сайт не запустится. LocMemCache живёт в одном процессе и
+# годится только для одного процесса - разработки и тестов.
+WORKERS: int = int(os.environ.get('YATUBE_WORKERS', '1'))
+
+if os.environ.get('YATUBE_MEMCACHED'):
+    DEFAULT_CACHE = {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': os.environ['YATUBE_MEMCACHED'].split(','),
+    }
+elif WORKERS > 1:
+    raise ImproperlyConfigured(
+        'При YATUBE_WORKERS > 1 задайте YATUBE_MEMCACHED: кэш лент '
+        'и ограничений частоты должен быть общим для всех процессов')
+else:
+    DEFAULT_CACHE = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+
+CACHES = {
+    'default': DEFAULT_CACHE,
+}
+
+# Сессии читаются из кэша, а база нужна только при промахе и записи.
+# Кэш тот же общий default: сессия, изменённая или удалённая в одном
+# процессе, не останется старой в другом, а вытесненная из memcached
+# снова читается из базы.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+SESSION_CACHE_ALIAS = 'default'
+
+SESSION_SAVE_EVERY_REQUEST = False
+
+# Профиль SQLite для нагрузки: WAL, отложенный fsync, mmap и ожидание
+# блокировок вместо ошибок. PRAGMA применяются в core.sqlite.configure_sqlite,
+# а транзакции начинаются с BEGIN IMMEDIATE (core.backends.sqlite3).
+# Включается на сервере переменной окружения YATUBE_SQLITE_PRODUCTION=1.
+SQLITE_PRODUCTION: bool = os.environ.get('YATUBE_SQLITE_PRODUCTION') == '1'
+
+SQLITE_PRAGMAS: dict = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    # sqlite3.connect по умолчанию уже ждёт 5 секунд.
+    'busy_timeout': 20_000,
+}
+
+DATABASE_ROUTERS = ['core.replicas.PrimaryReplicaRouter']
+
+DATABASE_REPLICAS: list = [alias for alias in DATABASES if alias != 'default']
+
+REPLICA_PIN_COOKIE: str = 'primary_pin'
+
+REPLICA_STICKY_SECONDS: int = 15
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -109,12 +204,63 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+STATICFILES_STORAGE: str = (
+    'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+    else 'core.staticfiles.CompressedManifestStaticFilesStorage'
+)
+
+STATIC_COMPRESS_EXTENSIONS: tuple = (
+    '.css', '.js', '.svg', '.ico', '.json', '.map', '.txt', '.xml',
+)
+
+STATIC_COMPRESS_MIN_SIZE: int = 256
+
+STATIC_MAX_AGE: int = 60 * 60 * 24 * 365
+
+STATIC_SERVE: bool = True
+
+MEDIA_URL = '/media/'
+
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+THUMBNAIL_WORKER_INTERVAL: int = 5
+
+THUMBNAIL_WORKER_BATCH: int = 50
+
+THUMBNAIL_MAX_ATTEMPTS: int = 5
+
+THUMBNAIL_RETRY_DELAY: int = 60
+
+JOB_BATCH_SIZE: int = 100
+
+JOB_MAX_ATTEMPTS: int = 5
+
+JOB_RETRY_DELAY: int = 30
+
+JOB_LEASE: int = 60 * 5
+
+JOB_POLL_INTERVAL: float = 1.0
+
+# Ведра жетонов: (сколько попыток, за сколько секунд) по адресу клиента
+# и по полю формы. Применяются в core.ratelimit.rate_limit. Ведра лежат
+# в кэше default: с кэшем в памяти процесса каждый процесс считал бы
+# попытки сам, и лимит умножился бы на их число.
+RATE_LIMITS: dict = {
+    'login': {'ip': (20, 60), 'username': (10, 60 * 5)},
+    'signup': {'ip': (5, 60 * 10)},
+    'password_reset': {'ip': (5, 60 * 10), 'email': (3, 60 * 60)},
+}
+
 LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
 
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+
+QUEUED_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')